@@ -10,89 +10,35 @@ This script is called by Claude at startup to determine:
 3. What workflow should we guide the user through?
 """
 
+import json
 import os
-import subprocess
+import re
+import shutil
 import sys
-from pathlib import Path
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 
+# NOTE: subprocess is imported lazily (only needed on a GHDL cache miss) and
+# pathlib is avoided entirely - this module is imported on every session start.
 
-def detect_runtime_environment() -> str:
-    """
-    Detect if we're running in Claude CLI (local) or Claude Web (cloud)
-
-    Returns:
-        "local" - Running in Claude Code CLI on user's machine
-        "cloud" - Running in Claude Web, Codespaces, or containerized environment
-    """
-    # Check for cloud environment indicators
-    cloud_indicators = [
-        os.environ.get("CODESPACES"),  # GitHub Codespaces
-        os.environ.get("GITPOD_WORKSPACE_ID"),  # Gitpod
-        os.environ.get("REMOTE_CONTAINERS"),  # VS Code Remote Containers
-        Path("/.dockerenv").exists(),  # Docker container
-        Path("/workspace").exists() and os.environ.get("HOME") == "/root",  # Codespaces pattern
-    ]
-
-    if any(cloud_indicators):
-        return "cloud"
+# On-disk cache for the GHDL probe (keyed on binary path + stat)
+GHDL_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "forge-vhdl", "ghdl.json")
 
-    # Default to local (safest assumption for new template repos)
-    return "local"
-
-
-def check_ghdl_installed() -> Tuple[bool, str]:
-    """
-    Check if GHDL is available in PATH
-
-    Returns:
-        (is_installed, version_string)
-    """
-    try:
-        result = subprocess.run(
-            ["ghdl", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            version = result.stdout.split('\n')[0]
-            return True, version
-        else:
-            return False, ""
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return False, ""
+# Version token in `ghdl --version` output, e.g. "GHDL 4.1.0 (tarball) [Dunoon edition]"
+_GHDL_VERSION_RE = re.compile(r"GHDL\s+(\S+)")
 
+# Environment variables whose (non-empty) presence means a cloud session
+_CLOUD_ENV_KEYS = (
+    "CODESPACES",  # GitHub Codespaces
+    "GITPOD_WORKSPACE_ID",  # Gitpod
+    "REMOTE_CONTAINERS",  # VS Code Remote Containers
+)
 
-def check_claude_cli_config() -> Dict[str, bool]:
-    """
-    Check Claude Code CLI configuration for recommended settings
 
-    Returns:
-        Dictionary with config checks (for local environments only)
-    """
-    # These are recommendations for the user to manually verify
-    # We can't programmatically read Claude CLI config (it's internal)
-    return {
-        "verbose_output": None,  # User should check: false (recommended)
-        "output_style": None,  # User should check: default (recommended)
-        "auto_compact": None,  # User should check: false (better for logs)
-    }
+# =============================================================================
+# Startup banners (plain templates; rendered only for the selected variant)
+# =============================================================================
 
-
-def generate_startup_message() -> str:
-    """
-    Generate environment-specific startup message for Claude to display
-
-    Returns:
-        Formatted message string
-    """
-    runtime = detect_runtime_environment()
-    ghdl_installed, ghdl_version = check_ghdl_installed()
-
-    if runtime == "cloud":
-        if ghdl_installed:
-            return f"""
+_BANNER_CLOUD_OK = """
 ╔════════════════════════════════════════════════════════════════════╗
 ║  🌐 CLOUD ENVIRONMENT DETECTED                                     ║
 ║  ✅ GHDL Found: {ghdl_version:<50} ║
@@ -102,8 +48,8 @@ def generate_startup_message() -> str:
 
 Loading cloud-optimized CLAUDE.md instructions...
 """
-        else:
-            return f"""
+
+_BANNER_CLOUD_NO_GHDL = """
 ╔════════════════════════════════════════════════════════════════════╗
 ║  🌐 CLOUD ENVIRONMENT DETECTED                                     ║
 ║  ⚠️  GHDL NOT FOUND                                                ║
@@ -115,9 +61,7 @@ Loading cloud-optimized CLAUDE.md instructions...
 ╚════════════════════════════════════════════════════════════════════╝
 """
 
-    else:  # local
-        if ghdl_installed:
-            return f"""
+_BANNER_LOCAL_OK = """
 ╔════════════════════════════════════════════════════════════════════╗
 ║  💻 LOCAL ENVIRONMENT DETECTED (Claude Code CLI)                   ║
 ║  ✅ GHDL Found: {ghdl_version:<50} ║
@@ -139,8 +83,8 @@ Loading cloud-optimized CLAUDE.md instructions...
 
 Loading local-optimized CLAUDE.md instructions...
 """
-        else:
-            return f"""
+
+_BANNER_LOCAL_NO_GHDL = """
 ╔════════════════════════════════════════════════════════════════════╗
 ║  💻 LOCAL ENVIRONMENT DETECTED (Claude Code CLI)                   ║
 ║  ⚠️  GHDL NOT FOUND                                                ║
@@ -161,6 +105,195 @@ Loading local-optimized CLAUDE.md instructions...
 """
 
 
+def detect_runtime_environment() -> str:
+    """
+    Detect if we're running in Claude CLI (local) or Claude Web (cloud)
+
+    Returns:
+        "local" - Running in Claude Code CLI on user's machine
+        "cloud" - Running in Claude Web, Codespaces, or containerized environment
+    """
+    # Environment variables are free to check - decide on them first
+    env = os.environ
+    if any(env.get(key) for key in _CLOUD_ENV_KEYS):
+        return "cloud"
+
+    # Filesystem markers cost a syscall each - only probe when needed
+    if os.access("/.dockerenv", os.F_OK):  # Docker container
+        return "cloud"
+    if env.get("HOME") == "/root" and os.access("/workspace", os.F_OK):  # Codespaces pattern
+        return "cloud"
+
+    # Default to local (safest assumption for new template repos)
+    return "local"
+
+
+def ghdl_path() -> Optional[str]:
+    """
+    Locate the GHDL binary without launching it
+
+    Returns:
+        Absolute path to `ghdl`, or None if it is not in PATH
+    """
+    return shutil.which("ghdl")
+
+
+def _cached_ghdl(path: str, refresh: bool = False, timeout: float = 5) -> str:
+    """
+    Read the GHDL version string, memoized on disk
+
+    The cache key is the resolved binary path plus its mtime and size, so
+    upgrading or replacing GHDL invalidates the entry automatically.
+
+    Args:
+        path: Resolved GHDL binary (from ghdl_path())
+        refresh: Ignore any cached entry and re-run `ghdl --version`
+        timeout: Seconds to wait for `ghdl --version` on a cache miss
+
+    Returns:
+        First line of `ghdl --version`, or "" if GHDL could not be run
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    key = f"{path}:{st.st_mtime_ns}:{st.st_size}"
+
+    cache = {}
+    if not refresh:
+        try:
+            with open(GHDL_CACHE_FILE) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if isinstance(cache, dict) and key in cache:
+            return cache[key]
+
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            [path, "--version"],
+            capture_output=True,
+            timeout=timeout
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    if result.returncode != 0:
+        return ""
+    # Only the first line matters; don't decode or split the whole banner
+    version = result.stdout.partition(b"\n")[0].decode(errors="replace").strip()
+
+    # Write atomically so a concurrent session never reads a partial file
+    try:
+        os.makedirs(os.path.dirname(GHDL_CACHE_FILE), exist_ok=True)
+        tmp = f"{GHDL_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({key: version}, f)
+        os.replace(tmp, GHDL_CACHE_FILE)
+    except OSError:
+        pass  # Cache is best-effort; detection result is still valid
+
+    return version
+
+
+# In-process memo for _ghdl_version(): (path, version) of the last probe
+_ghdl_memo: Optional[Tuple[str, str]] = None
+
+
+def _ghdl_version(path: str, timeout: float = 5, refresh: bool = False) -> str:
+    """
+    In-process memo over _cached_ghdl(): at most one probe per interpreter
+
+    Keyed on `path` only, so callers passing different timeouts share the
+    entry; `timeout` only applies when the probe actually has to run.
+    """
+    global _ghdl_memo
+    if not refresh and _ghdl_memo is not None and _ghdl_memo[0] == path:
+        return _ghdl_memo[1]
+    version = _cached_ghdl(path, refresh=refresh, timeout=timeout)
+    _ghdl_memo = (path, version)
+    return version
+
+
+def parse_ghdl_version(version_line: str, default: str = "unknown") -> str:
+    """
+    Extract the numeric version from a `ghdl --version` first line
+
+    Tolerant of vendor prefixes and trailing build info.
+
+    Args:
+        version_line: e.g. "GHDL 4.1.0 (tarball) [Dunoon edition]"
+        default: Returned when no version token is found
+
+    Returns:
+        Version token (e.g. "4.1.0"), or `default`
+    """
+    m = _GHDL_VERSION_RE.search(version_line)
+    return m.group(1) if m else default
+
+
+def check_ghdl_installed(refresh: bool = False, timeout: float = 5) -> Tuple[bool, str]:
+    """
+    Check if GHDL is available in PATH
+
+    Existence is decided by ghdl_path(); the version is only read (from the
+    cache or `ghdl --version`) once the binary is known to exist.
+
+    Args:
+        refresh: Bypass the on-disk cache and re-probe GHDL
+        timeout: Seconds to wait for `ghdl --version` when it has to run
+
+    Returns:
+        (is_installed, version_string)
+    """
+    path = ghdl_path()
+    if path is None:
+        return False, ""
+    version = _ghdl_version(path, timeout, refresh=refresh)
+    return bool(version), version
+
+
+def check_claude_cli_config() -> Dict[str, bool]:
+    """
+    Check Claude Code CLI configuration for recommended settings
+
+    Returns:
+        Dictionary with config checks (for local environments only)
+    """
+    # These are recommendations for the user to manually verify
+    # We can't programmatically read Claude CLI config (it's internal)
+    return {
+        "verbose_output": None,  # User should check: false (recommended)
+        "output_style": None,  # User should check: default (recommended)
+        "auto_compact": None,  # User should check: false (better for logs)
+    }
+
+
+def generate_startup_message() -> str:
+    """
+    Generate environment-specific startup message for Claude to display
+
+    Returns:
+        Formatted message string
+    """
+    runtime = detect_runtime_environment()
+
+    # Only the "GHDL found" banners show a version, so only read it then
+    path = ghdl_path()
+    ghdl_version = _ghdl_version(path) if path else ""
+
+    if runtime == "cloud":
+        if ghdl_version:
+            return _BANNER_CLOUD_OK.format(ghdl_version=ghdl_version)
+        return _BANNER_CLOUD_NO_GHDL
+
+    # local
+    if ghdl_version:
+        return _BANNER_LOCAL_OK.format(ghdl_version=ghdl_version)
+    return _BANNER_LOCAL_NO_GHDL
+
+
 def get_claude_md_variant() -> str:
     """
     Determine which CLAUDE.md variant to load
@@ -174,8 +307,10 @@ def get_claude_md_variant() -> str:
 
 if __name__ == "__main__":
     # When run directly, print environment info for debugging
+    # Usage: python env_detect.py [--refresh]   (--refresh bypasses GHDL cache)
+    refresh = "--refresh" in sys.argv[1:]
     runtime = detect_runtime_environment()
-    ghdl_installed, ghdl_version = check_ghdl_installed()
+    ghdl_installed, ghdl_version = check_ghdl_installed(refresh=refresh)
 
     print(f"Runtime Environment: {runtime}")
     print(f"GHDL Installed: {ghdl_installed}")
@@ -4,28 +4,19 @@ VHDL-FORGE Session Start Hook
 Lightweight banner + /forge-start announcement for local CLI sessions
 
 Output: Single-line banner with /forge-start suggestion
+
+Cloud detection here only looks at environment variables, unlike
+env_detect.detect_runtime_environment(), which also treats Docker containers
+and /workspace as cloud. The GHDL probe is shared with env_detect.py (same
+on-disk cache). When run as a script, Python puts this file's directory on
+sys.path, so env_detect is importable directly.
 """
 
-import subprocess
-import sys
 import os
+import sys
+
+from env_detect import check_ghdl_installed, parse_ghdl_version
 
-def check_ghdl():
-    """Quick GHDL availability check"""
-    try:
-        result = subprocess.run(
-            ["ghdl", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        if result.returncode == 0:
-            # Extract version (first line usually contains it)
-            version = result.stdout.split('\n')[0].strip()
-            return True, version
-        return False, None
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        return False, None
 
 def detect_environment():
     """Detect local vs cloud"""
@@ -47,17 +38,18 @@ def detect_environment():
     # Default to local
     return 'local'
 
+
 def main():
     """Output lightweight session start banner"""
 
     env = detect_environment()
-    ghdl_ok, ghdl_version = check_ghdl()
 
     if env == 'local':
         # Local CLI environment - show banner
+        ghdl_ok, ghdl_version = check_ghdl_installed(timeout=2)
         if ghdl_ok:
             # Extract short version (e.g., "5.0.1" from full version string)
-            short_ver = ghdl_version.split()[1] if len(ghdl_version.split()) > 1 else "installed"
+            short_ver = parse_ghdl_version(ghdl_version, default="installed")
 
             print(f"🔧 VHDL-FORGE Local | GHDL {short_ver} | Type /forge-start for interactive setup")
         else:
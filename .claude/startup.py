@@ -9,16 +9,13 @@ It detects the environment (local CLI vs cloud) and displays appropriate guidanc
 """
 
 import sys
-from pathlib import Path
 
-# Add .claude directory to path so we can import env_detect
-claude_dir = Path(__file__).parent
-sys.path.insert(0, str(claude_dir))
+# No sys.path manipulation needed: when this file is run as a script, Python
+# already puts its directory (.claude/) first on sys.path, so the sibling
+# env_detect module imports directly.
 
 try:
     from env_detect import (
-        detect_runtime_environment,
-        check_ghdl_installed,
         generate_startup_message,
         get_claude_md_variant
     )
@@ -0,0 +1,44 @@
+--------------------------------------------------------------------------------
+-- Test shim: free-running pulse counter
+-- Purpose: Count cycles where a probe signal is high, entirely in HDL
+--
+-- Python-side counting (conftest.count_pulses) wakes the cocotb scheduler on
+-- every clock edge. Instantiate this in a test wrapper on the signal of
+-- interest and expose `count` as a port instead; tests then read it before
+-- and after an observation window (two reads, one ClockCycles trigger).
+--
+-- The counter is free-running and wraps at 2**WIDTH, so callers take the
+-- difference modulo 2**WIDTH rather than clearing it.
+--------------------------------------------------------------------------------
+
+library IEEE;
+use IEEE.STD_LOGIC_1164.ALL;
+use IEEE.NUMERIC_STD.ALL;
+
+entity forge_cocotb_pulse_counter is
+    generic (
+        WIDTH : positive := 32
+    );
+    port (
+        clk   : in  std_logic;
+        probe : in  std_logic;                           -- Sampled every rising edge
+        count : out std_logic_vector(WIDTH-1 downto 0)   -- Probe-high samples (wraps)
+    );
+end entity forge_cocotb_pulse_counter;
+
+architecture rtl of forge_cocotb_pulse_counter is
+    signal count_r : unsigned(WIDTH-1 downto 0) := (others => '0');
+begin
+
+    process(clk)
+    begin
+        if rising_edge(clk) then
+            if probe = '1' then
+                count_r <= count_r + 1;
+            end if;
+        end if;
+    end process;
+
+    count <= std_logic_vector(count_r);
+
+end architecture rtl;
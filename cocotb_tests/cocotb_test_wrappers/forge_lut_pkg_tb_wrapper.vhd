@@ -7,6 +7,9 @@
 -- This wrapper exposes forge_lut_pkg functions through entity ports so CocotB
 -- can test the LUT infrastructure. Since packages contain only functions,
 -- this wrapper provides combinational logic to exercise all package features.
+--
+-- clk is generated here (CLK_PERIOD) and exposed as an OUTPUT port, so the
+-- cocotb scheduler is only woken on edges a test actually awaits.
 --------------------------------------------------------------------------------
 
 library IEEE;
@@ -17,9 +20,13 @@ use IEEE.NUMERIC_STD.ALL;
 use work.forge_lut_pkg.all;
 
 entity forge_lut_pkg_tb_wrapper is
+    generic (
+        CLK_PERIOD : time := 10 ns  -- 100 MHz (matches the old setup_clock period)
+    );
     port (
-        -- Control signals
-        clk           : in  std_logic;
+        -- Clock (generated here, observed by CocoTB) and reset
+        clk           : out std_logic;
+        hdl_clk_period_ns : out std_logic_vector(15 downto 0);  -- CLK_PERIOD in ns (read by setup_clock)
         reset         : in  std_logic;
 
         -- Test inputs
@@ -88,14 +95,25 @@ architecture rtl of forge_lut_pkg_tb_wrapper is
 
     -- Internal signals
     signal index_natural : natural;
-
+    signal clk_i : std_logic := '0';
 begin
 
+    clk_gen : process
+    begin
+        clk_i <= '0';
+        wait for CLK_PERIOD / 2;
+        clk_i <= '1';
+        wait for CLK_PERIOD / 2;
+    end process clk_gen;
+
+    clk <= clk_i;
+    hdl_clk_period_ns <= std_logic_vector(to_unsigned(CLK_PERIOD / 1 ns, 16));
+
     -- Convert test_index to natural
     index_natural <= to_integer(unsigned(test_index));
 
     -- Combinational logic for function testing
-    process(clk, reset)
+    process(clk_i, reset)
     begin
         if reset = '1' then
             lut_output_unsigned <= (others => '0');
@@ -105,7 +123,7 @@ begin
             linear_5v_lut_out   <= (others => '0');
             linear_3v3_lut_out  <= (others => '0');
 
-        elsif rising_edge(clk) then
+        elsif rising_edge(clk_i) then
             -- Test lut_lookup (unsigned) with bounds checking
             if sel_lut_lookup = '1' then
                 lut_output_unsigned <= lut_lookup(TEST_LUT_UNSIGNED, index_natural);
@@ -0,0 +1,83 @@
+--------------------------------------------------------------------------------
+-- Test wrapper for forge_util_clk_divider
+-- Purpose: Generate the clock in HDL instead of a Python cocotb Clock
+--
+-- A Python Clock wakes the cocotb scheduler twice per period, which dominates
+-- runtime for small DUTs like this one. Here the clock is a free-running VHDL
+-- process and is exposed as an OUTPUT port, so tests can still await
+-- RisingEdge(dut.clk) / ClockCycles(dut.clk, N) but never drive it.
+--
+-- clk_en_count is a forge_cocotb_pulse_counter on clk_en, so pulse-count
+-- checks read two integers instead of sampling clk_en every cycle.
+--
+-- All other ports pass straight through to the DUT.
+--------------------------------------------------------------------------------
+
+library IEEE;
+use IEEE.STD_LOGIC_1164.ALL;
+use IEEE.NUMERIC_STD.ALL;
+
+entity forge_util_clk_divider_tb_wrapper is
+    generic (
+        CLK_PERIOD : time    := 10 ns;  -- 100 MHz (matches DEFAULT_CLK_PERIOD_NS)
+        MAX_DIV    : natural := 256
+    );
+    port (
+        -- Clock (generated here, observed by CocoTB)
+        clk      : out std_logic;
+        hdl_clk_period_ns : out std_logic_vector(15 downto 0);  -- CLK_PERIOD in ns (read by setup_clock)
+
+        -- DUT ports
+        rst_n    : in  std_logic;
+        enable   : in  std_logic;
+        div_sel  : in  std_logic_vector(7 downto 0);
+        clk_en   : out std_logic;
+        stat_reg : out std_logic_vector(7 downto 0);
+
+        -- Test observation (not part of the DUT)
+        clk_en_count : out std_logic_vector(31 downto 0)  -- clk_en high cycles (free-running, wraps)
+    );
+end entity forge_util_clk_divider_tb_wrapper;
+
+architecture tb of forge_util_clk_divider_tb_wrapper is
+    signal clk_i    : std_logic := '0';
+    signal clk_en_i : std_logic;
+begin
+
+    clk_gen : process
+    begin
+        clk_i <= '0';
+        wait for CLK_PERIOD / 2;
+        clk_i <= '1';
+        wait for CLK_PERIOD / 2;
+    end process clk_gen;
+
+    clk <= clk_i;
+    hdl_clk_period_ns <= std_logic_vector(to_unsigned(CLK_PERIOD / 1 ns, 16));
+
+    clk_en <= clk_en_i;
+
+    clk_en_counter : entity work.forge_cocotb_pulse_counter
+        generic map (
+            WIDTH => 32
+        )
+        port map (
+            clk   => clk_i,
+            probe => clk_en_i,
+            count => clk_en_count
+        );
+
+    dut : entity work.forge_util_clk_divider
+        generic map (
+            MAX_DIV => MAX_DIV
+        )
+        port map (
+            clk      => clk_i,
+            rst_n    => rst_n,
+            enable   => enable,
+            div_sel  => div_sel,
+            clk_en   => clk_en_i,
+            stat_reg => stat_reg
+        );
+
+end architecture tb;
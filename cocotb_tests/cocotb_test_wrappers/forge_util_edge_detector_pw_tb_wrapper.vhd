@@ -0,0 +1,129 @@
+--------------------------------------------------------------------------------
+-- Test wrapper for forge_util_edge_detector_pw
+-- Purpose: Generate the clock in HDL instead of a Python cocotb Clock
+--
+-- The clock is a free-running VHDL process exposed as an OUTPUT port, so
+-- tests can await RisingEdge(dut.clk) / ClockCycles(dut.clk, N) without the
+-- cocotb scheduler waking twice per period to toggle it.
+--
+-- rise_pw_max / fall_pw_max hold the longest run of consecutive high cycles
+-- seen on rising_edge_out / falling_edge_out since the last pw_clear (or
+-- reset), so a pulse-width check is one read instead of a per-cycle loop.
+--
+-- probe3 packs edge_detected & rising_edge_out & falling_edge_out so all
+-- three outputs are sampled with a single read.
+--
+-- All other ports pass straight through to the DUT.
+--------------------------------------------------------------------------------
+
+library IEEE;
+use IEEE.STD_LOGIC_1164.ALL;
+use IEEE.NUMERIC_STD.ALL;
+
+entity forge_util_edge_detector_pw_tb_wrapper is
+    generic (
+        CLK_PERIOD  : time     := 8 ns;  -- 125 MHz (matches P1 setup_clock period)
+        EDGE_TYPE   : string   := "both";
+        PULSE_WIDTH : positive := 1
+    );
+    port (
+        -- Clock (generated here, observed by CocoTB)
+        clk              : out std_logic;
+        hdl_clk_period_ns : out std_logic_vector(15 downto 0);  -- CLK_PERIOD in ns (read by setup_clock)
+
+        -- DUT ports
+        rst_n            : in  std_logic;
+        enable           : in  std_logic;
+        signal_in        : in  std_logic;
+        edge_detected    : out std_logic;
+        rising_edge_out  : out std_logic;
+        falling_edge_out : out std_logic;
+
+        -- Test observation (not part of the DUT)
+        pw_clear         : in  std_logic := '0';           -- Clear captured widths
+        rise_pw_max      : out std_logic_vector(7 downto 0);
+        fall_pw_max      : out std_logic_vector(7 downto 0);
+        probe3           : out std_logic_vector(2 downto 0)  -- edge & rising & falling
+    );
+end entity forge_util_edge_detector_pw_tb_wrapper;
+
+architecture tb of forge_util_edge_detector_pw_tb_wrapper is
+    signal clk_i     : std_logic := '0';
+    signal edge_i    : std_logic;
+    signal rising_i  : std_logic;
+    signal falling_i : std_logic;
+    signal rise_pw   : unsigned(7 downto 0);
+    signal fall_pw   : unsigned(7 downto 0);
+    signal rise_max  : unsigned(7 downto 0);
+    signal fall_max  : unsigned(7 downto 0);
+begin
+
+    clk_gen : process
+    begin
+        clk_i <= '0';
+        wait for CLK_PERIOD / 2;
+        clk_i <= '1';
+        wait for CLK_PERIOD / 2;
+    end process clk_gen;
+
+    clk <= clk_i;
+    hdl_clk_period_ns <= std_logic_vector(to_unsigned(CLK_PERIOD / 1 ns, 16));
+
+    pw_capture : process(clk_i, rst_n)
+    begin
+        if rst_n = '0' then
+            rise_pw  <= (others => '0');
+            fall_pw  <= (others => '0');
+            rise_max <= (others => '0');
+            fall_max <= (others => '0');
+        elsif rising_edge(clk_i) then
+            if pw_clear = '1' then
+                rise_pw  <= (others => '0');
+                fall_pw  <= (others => '0');
+                rise_max <= (others => '0');
+                fall_max <= (others => '0');
+            else
+                if rising_i = '1' then
+                    rise_pw <= rise_pw + 1;
+                    if rise_pw + 1 > rise_max then
+                        rise_max <= rise_pw + 1;
+                    end if;
+                else
+                    rise_pw <= (others => '0');
+                end if;
+
+                if falling_i = '1' then
+                    fall_pw <= fall_pw + 1;
+                    if fall_pw + 1 > fall_max then
+                        fall_max <= fall_pw + 1;
+                    end if;
+                else
+                    fall_pw <= (others => '0');
+                end if;
+            end if;
+        end if;
+    end process pw_capture;
+
+    edge_detected    <= edge_i;
+    rising_edge_out  <= rising_i;
+    falling_edge_out <= falling_i;
+    rise_pw_max      <= std_logic_vector(rise_max);
+    fall_pw_max      <= std_logic_vector(fall_max);
+    probe3           <= edge_i & rising_i & falling_i;
+
+    dut : entity work.forge_util_edge_detector_pw
+        generic map (
+            EDGE_TYPE   => EDGE_TYPE,
+            PULSE_WIDTH => PULSE_WIDTH
+        )
+        port map (
+            clk              => clk_i,
+            rst_n            => rst_n,
+            enable           => enable,
+            signal_in        => signal_in,
+            edge_detected    => edge_i,
+            rising_edge_out  => rising_i,
+            falling_edge_out => falling_i
+        );
+
+end architecture tb;
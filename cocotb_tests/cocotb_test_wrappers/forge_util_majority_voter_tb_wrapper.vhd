@@ -0,0 +1,116 @@
+--------------------------------------------------------------------------------
+-- Test wrapper for forge_util_majority_voter
+-- Purpose: Generate the clock in HDL instead of a Python cocotb Clock
+--
+-- The clock is a free-running VHDL process exposed as an OUTPUT port, so
+-- tests can await RisingEdge(dut.clk) / ClockCycles(dut.clk, N) without the
+-- cocotb scheduler waking twice per period to toggle it.
+--
+-- test_mode='1' runs the whole truth table in HDL: a 3-bit counter drives
+-- (A,B,C) = 000..111 on consecutive cycles and out_hist shifts in one
+-- majority_out sample per row (row 000 ends up in bit 7). A sweep is one
+-- write and one read from Python instead of one trigger per row.
+--
+-- input_abc packs (A,B,C) into one bus (A = bit 2) so set_inputs is a single
+-- handle write per row instead of three. All other ports pass straight
+-- through to the DUT.
+--------------------------------------------------------------------------------
+
+library IEEE;
+use IEEE.STD_LOGIC_1164.ALL;
+use IEEE.NUMERIC_STD.ALL;
+
+entity forge_util_majority_voter_tb_wrapper is
+    generic (
+        CLK_PERIOD : time    := 8 ns;  -- 125 MHz (matches P1 setup_clock period)
+        REGISTERED : boolean := false
+    );
+    port (
+        -- Clock (generated here, observed by CocoTB)
+        clk          : out std_logic;
+        hdl_clk_period_ns : out std_logic_vector(15 downto 0);  -- CLK_PERIOD in ns (read by setup_clock)
+
+        -- DUT ports
+        rst_n        : in  std_logic;
+        enable       : in  std_logic;
+        input_abc    : in  std_logic_vector(2 downto 0);  -- A & B & C
+        majority_out : out std_logic;
+
+        -- Test observation (not part of the DUT)
+        test_mode    : in  std_logic := '0';              -- Run truth-table sweep
+        out_hist     : out std_logic_vector(7 downto 0)   -- Sweep results, row 000 = MSB
+    );
+end entity forge_util_majority_voter_tb_wrapper;
+
+architecture tb of forge_util_majority_voter_tb_wrapper is
+    -- Registered DUT output lags its inputs by one clock
+    function output_latency(registered : boolean) return natural is
+    begin
+        if registered then
+            return 1;
+        end if;
+        return 0;
+    end function;
+
+    constant LATENCY : natural := output_latency(REGISTERED);
+
+    signal clk_i      : std_logic := '0';
+    signal sweep_cnt  : unsigned(3 downto 0) := (others => '0');
+    signal sweep_row  : std_logic_vector(2 downto 0);
+    signal hist       : std_logic_vector(7 downto 0) := (others => '0');
+    signal dut_a      : std_logic;
+    signal dut_b      : std_logic;
+    signal dut_c      : std_logic;
+    signal majority_i : std_logic;
+begin
+
+    clk_gen : process
+    begin
+        clk_i <= '0';
+        wait for CLK_PERIOD / 2;
+        clk_i <= '1';
+        wait for CLK_PERIOD / 2;
+    end process clk_gen;
+
+    clk <= clk_i;
+    hdl_clk_period_ns <= std_logic_vector(to_unsigned(CLK_PERIOD / 1 ns, 16));
+
+    -- Truth-table sweep: rows 0..7, then hold 111 while the last sample lands
+    sweep_row <= std_logic_vector(sweep_cnt(2 downto 0)) when sweep_cnt < 8 else "111";
+
+    sweep : process(clk_i)
+    begin
+        if rising_edge(clk_i) then
+            if test_mode /= '1' then
+                sweep_cnt <= (others => '0');
+            elsif sweep_cnt < 8 + LATENCY then
+                if sweep_cnt >= LATENCY then
+                    hist <= hist(6 downto 0) & majority_i;
+                end if;
+                sweep_cnt <= sweep_cnt + 1;
+            end if;
+        end if;
+    end process sweep;
+
+    dut_a <= sweep_row(2) when test_mode = '1' else input_abc(2);
+    dut_b <= sweep_row(1) when test_mode = '1' else input_abc(1);
+    dut_c <= sweep_row(0) when test_mode = '1' else input_abc(0);
+
+    majority_out <= majority_i;
+    out_hist     <= hist;
+
+    dut : entity work.forge_util_majority_voter
+        generic map (
+            REGISTERED => REGISTERED
+        )
+        port map (
+            clk          => clk_i,
+            rst_n        => rst_n,
+            enable       => enable,
+            input_a      => dut_a,
+            input_b      => dut_b,
+            input_c      => dut_c,
+            majority_out => majority_i
+        );
+
+end architecture tb;
@@ -5,6 +5,9 @@
 -- IMPORTANT: CocoTB cannot access 'real' or 'boolean' types!
 -- This wrapper uses only digital types (signed, std_logic) at the entity
 -- boundary and converts internally.
+--
+-- clk is generated here (CLK_PERIOD) and exposed as an OUTPUT port, so the
+-- cocotb scheduler is only woken on edges a test actually awaits.
 --------------------------------------------------------------------------------
 
 library IEEE;
@@ -15,9 +18,13 @@ library work;
 use work.forge_voltage_3v3_pkg.all;
 
 entity forge_voltage_3v3_pkg_tb_wrapper is
+    generic (
+        CLK_PERIOD : time := 10 ns  -- 100 MHz (matches the old setup_clock period)
+    );
     port (
-        -- Clock and reset
-        clk : in std_logic;
+        -- Clock (generated here, observed by CocoTB) and reset
+        clk : out std_logic;
+        hdl_clk_period_ns : out std_logic_vector(15 downto 0);  -- CLK_PERIOD in ns (read by setup_clock)
         reset : in std_logic;
 
         -- Test inputs (digital types only!)
@@ -45,14 +52,26 @@ architecture rtl of forge_voltage_3v3_pkg_tb_wrapper is
     signal voltage_real : real;
     signal voltage_out_real : real;
     signal clamped_real : real;
+    signal clk_i : std_logic := '0';
 begin
 
+    clk_gen : process
+    begin
+        clk_i <= '0';
+        wait for CLK_PERIOD / 2;
+        clk_i <= '1';
+        wait for CLK_PERIOD / 2;
+    end process clk_gen;
+
+    clk <= clk_i;
+    hdl_clk_period_ns <= std_logic_vector(to_unsigned(CLK_PERIOD / 1 ns, 16));
+
     -- Convert digital input to real voltage for package functions
     -- Scale: 0x0000 → 0.0V, 0x7FFF (32767) → 3.3V
     voltage_real <= (real(to_integer(test_voltage_digital)) / 32767.0) * 3.3;
 
     -- Registered outputs for timing stability
-    process(clk, reset)
+    process(clk_i, reset)
     begin
         if reset = '1' then
             digital_result <= (others => '0');
@@ -60,7 +79,7 @@ begin
             is_valid_result <= '0';
             clamped_result <= (others => '0');
 
-        elsif rising_edge(clk) then
+        elsif rising_edge(clk_i) then
             -- Test to_digital function
             if sel_to_digital = '1' then
                 digital_result <= to_digital(voltage_real);
@@ -5,6 +5,13 @@
 -- IMPORTANT: CocoTB cannot access 'real' or 'boolean' types!
 -- This wrapper uses only digital types (signed, std_logic) at the entity
 -- boundary and converts internally.
+--
+-- clk is generated here (CLK_PERIOD) and exposed as an OUTPUT port, so the
+-- cocotb scheduler is only woken on edges a test actually awaits.
+--
+-- Registers are held in reset for the first POR_CYCLES clock edges and the
+-- test inputs default to zero, so a test only needs to wait out the
+-- power-on reset; the reset port remains for a mid-test soft reset.
 --------------------------------------------------------------------------------
 
 library IEEE;
@@ -15,20 +22,23 @@ library work;
 use work.forge_voltage_5v0_pkg.all;
 
 entity forge_voltage_5v0_pkg_tb_wrapper is
+    generic (
+        CLK_PERIOD : time    := 10 ns;  -- 100 MHz (matches the old setup_clock period)
+        POR_CYCLES : natural := 3       -- Power-on reset length in clock edges
+    );
     port (
-        -- Clock and reset
-        clk : in std_logic;
-        reset : in std_logic;
+        -- Clock (generated here, observed by CocoTB) and reset
+        clk : out std_logic;
+        hdl_clk_period_ns : out std_logic_vector(15 downto 0);  -- CLK_PERIOD in ns (read by setup_clock)
+        reset : in std_logic := '0';
 
         -- Test inputs (digital types only!)
-        test_voltage_digital : in signed(15 downto 0);  -- Scaled voltage (0-32767)
-        test_digital : in signed(15 downto 0);
+        test_voltage_digital : in signed(15 downto 0) := (others => '0');  -- Scaled voltage (0-32767)
+        test_digital : in signed(15 downto 0) := (others => '0');
 
-        -- Function selects (one-hot)
-        sel_to_digital : in std_logic;
-        sel_from_digital : in std_logic;
-        sel_is_valid : in std_logic;
-        sel_clamp : in std_logic;
+        -- Function select (one-hot, packed so a test sets it in one write):
+        -- to_digital & from_digital & is_valid & clamp
+        sel_fn : in std_logic_vector(3 downto 0) := (others => '0');
 
         -- Conversion outputs (digital types only!)
         digital_result : out signed(15 downto 0);
@@ -45,22 +55,53 @@ architecture rtl of forge_voltage_5v0_pkg_tb_wrapper is
     signal voltage_real : real;
     signal voltage_out_real : real;
     signal clamped_real : real;
+    signal clk_i : std_logic := '0';
+    signal por_cnt : natural range 0 to POR_CYCLES := POR_CYCLES;
+    signal rst_i : std_logic;
+
+    alias sel_to_digital   : std_logic is sel_fn(3);
+    alias sel_from_digital : std_logic is sel_fn(2);
+    alias sel_is_valid     : std_logic is sel_fn(1);
+    alias sel_clamp        : std_logic is sel_fn(0);
 begin
 
+    clk_gen : process
+    begin
+        clk_i <= '0';
+        wait for CLK_PERIOD / 2;
+        clk_i <= '1';
+        wait for CLK_PERIOD / 2;
+    end process clk_gen;
+
+    clk <= clk_i;
+    hdl_clk_period_ns <= std_logic_vector(to_unsigned(CLK_PERIOD / 1 ns, 16));
+
+    -- Power-on reset, then follow the reset port
+    por : process(clk_i)
+    begin
+        if rising_edge(clk_i) then
+            if por_cnt /= 0 then
+                por_cnt <= por_cnt - 1;
+            end if;
+        end if;
+    end process por;
+
+    rst_i <= '1' when por_cnt /= 0 else reset;
+
     -- Convert digital input to real voltage for package functions
     -- Scale: 0x0000 → 0.0V, 0x7FFF (32767) → 5.0V
     voltage_real <= (real(to_integer(test_voltage_digital)) / 32767.0) * 5.0;
 
     -- Registered outputs for timing stability
-    process(clk, reset)
+    process(clk_i, rst_i)
     begin
-        if reset = '1' then
+        if rst_i = '1' then
             digital_result <= (others => '0');
             voltage_result <= (others => '0');
             is_valid_result <= '0';
             clamped_result <= (others => '0');
 
-        elsif rising_edge(clk) then
+        elsif rising_edge(clk_i) then
             -- Test to_digital function
             if sel_to_digital = '1' then
                 digital_result <= to_digital(voltage_real);
@@ -8,14 +8,13 @@ Author: Moku Instrument Forge Team
 Date: 2025-11-07
 """
 
-from pathlib import Path
+from forge_cocotb._paths import PROJECT_ROOT
 
 
 # Module identification
 MODULE_NAME = "forge_hierarchical_encoder"
 
-# HDL sources (relative to tests/ directory)
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+# HDL sources (relative to project root)
 VHDL_DIR = PROJECT_ROOT / "vhdl"
 
 HDL_SOURCES = [
@@ -37,6 +36,33 @@ RESET_CYCLES = 5
 SETTLE_CYCLES = 2
 
 
+def _expected_digital(state: int, status: int) -> int:
+    """Reference encoder formula (used to build EXPECTED_DIGITAL_TABLE)."""
+    # Base value from state (200 digital units per state)
+    base = state * DIGITAL_UNITS_PER_STATE
+
+    # Status offset (lower 7 bits)
+    status_lower = status & 0x7F
+    # Offset = status_lower * 100 / 128 (integer division; operand is
+    # non-negative, so >> 7 is exact)
+    offset = (status_lower * 100) >> 7
+
+    # Combined magnitude
+    combined = base + offset
+
+    # Apply fault flag (status bit 7)
+    fault_flag = (status >> 7) & 1
+    return -combined if fault_flag else combined
+
+
+# Full (state, status) -> expected output table: 64 states x 256 status bytes.
+# Built once at import so per-assertion lookups are a double index.
+EXPECTED_DIGITAL_TABLE = tuple(
+    tuple(_expected_digital(state, status) for status in range(256))
+    for state in range(64)
+)
+
+
 class TestValues:
     """Test value sets for different test phases (DIGITAL DOMAIN!)"""
 
@@ -64,33 +90,33 @@ class TestValues:
         Returns:
             Expected signed digital output value
 
+        Raises:
+            ValueError: If state or status is outside the encoder's range
+
         Examples:
             State=0, Status=0x00 → 0 digital units
             State=1, Status=0x00 → 200 digital units
             State=2, Status=0x40 → 450 digital units (400 base + 50 offset)
             State=2, Status=0xC0 → -450 digital units (fault flag set)
         """
-        # Base value from state (200 digital units per state)
-        base = state * DIGITAL_UNITS_PER_STATE
-
-        # Status offset (lower 7 bits)
-        status_lower = status & 0x7F
-        # Offset = status_lower * 100 / 128 (integer division)
-        offset = (status_lower * 100) // 128
-
-        # Combined magnitude
-        combined = base + offset
-
-        # Apply fault flag (status bit 7)
-        fault_flag = (status >> 7) & 1
-        return -combined if fault_flag else combined
+        # Negative indices would wrap around the table instead of failing
+        if not (0 <= state < 64 and 0 <= status < 256):
+            raise ValueError(f"state must be 0-63 and status 0-255, got state={state}, status={status}")
+        return EXPECTED_DIGITAL_TABLE[state][status]
 
 
 class ErrorMessages:
-    """Standardized error messages for test assertions"""
+    """
+    Standardized error messages for test assertions
+
+    Use them inline as the assert message, e.g.
+    `assert actual == expected, ErrorMessages.X.format(...)`. Python only
+    evaluates the message expression when the assertion fails, so passing
+    checks never pay for .format(). Don't pre-format into a variable.
+    """
 
     RESET_OUTPUT = "Output should be 0 after reset, got {}"
-    STATE_PROGRESSION = "State={}, status=0x00: expected {}, got {}"
+    SWEEP_MISMATCH = "State={}, status=0x{:02X}: expected {}, got {}"
     STATUS_OFFSET_NO_OFFSET = "State={}, status=0x00: expected {}, got {}"
     STATUS_OFFSET_MAX_OFFSET = "State={}, status=0x7F: expected {}, got {}"
     STATUS_OFFSET_DIRECTION = "Status offset should increase output (no_offset={}, max_offset={})"
@@ -8,6 +8,10 @@ Author: Claude Code
 Date: 2025-01-28
 """
 
+import os
+
+from forge_cocotb.test_base import VerbosityLevel
+
 # =============================================================================
 # Test Indices and Expected Values
 # =============================================================================
@@ -38,6 +42,12 @@ EXPECTED_LUT_UNSIGNED = {
     100: 0xFFFF,
 }
 
+# Dense view of the same mapping for every in-range index (0..100), so hot
+# loops index a tuple by position instead of hashing into the dict
+EXPECTED_LUT_UNSIGNED_TUP = tuple(
+    EXPECTED_LUT_UNSIGNED.get(i, int((i / 100) * 0xFFFF)) for i in range(101)
+)
+
 # For TEST_LUT_SIGNED (linear -32768 to +32767 mapping)
 # Formula: value = -32768 + (index / 100) * 65535
 EXPECTED_LUT_SIGNED = {
@@ -99,22 +109,31 @@ def voltage_to_digital_approx(voltage):
 # Predefined LUT Test Values
 # =============================================================================
 
+# Computed lazily on first access (PEP 562 module __getattr__) so importing
+# this module for an unrelated test does no floating-point work.
+#
 # LINEAR_5V_LUT: 0-5V using voltage_to_digital conversion
 # Index 50 should be ≈ 2.5V ≈ 16384
-LINEAR_5V_EXPECTED = {
-    0:   voltage_to_digital_approx(0.0),
-    50:  voltage_to_digital_approx(2.5),
-    100: voltage_to_digital_approx(5.0),
-}
-
+#
 # LINEAR_3V3_LUT: 0-3.3V using voltage_to_digital conversion
 # Index 50 should be ≈ 1.65V ≈ 10813
-LINEAR_3V3_EXPECTED = {
-    0:   voltage_to_digital_approx(0.0),
-    50:  voltage_to_digital_approx(1.65),
-    100: voltage_to_digital_approx(3.3),
+_LAZY_EXPECTED_VOLTAGES = {
+    "LINEAR_5V_EXPECTED":  {0: 0.0, 50: 2.5,  100: 5.0},
+    "LINEAR_3V3_EXPECTED": {0: 0.0, 50: 1.65, 100: 3.3},
 }
 
+
+def __getattr__(name):
+    if name in _LAZY_EXPECTED_VOLTAGES:
+        value = {
+            idx: voltage_to_digital_approx(voltage)
+            for idx, voltage in _LAZY_EXPECTED_VOLTAGES[name].items()
+        }
+        globals()[name] = value  # Cache: later lookups bypass __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # =============================================================================
 # Test Level Configuration
 # =============================================================================
@@ -126,7 +145,7 @@ P1_TEST_INDICES = [0, 50, 100, 150]  # Min, mid, max, overflow
 P2_TEST_INDICES = [0, 1, 10, 25, 50, 75, 90, 99, 100, 101, 150, 255]
 
 # P3 (Comprehensive) - Exhaustive testing
-P3_TEST_INDICES = list(range(0, 256))  # All possible 8-bit values
+P3_TEST_INDICES = range(0, 256)  # All possible 8-bit values (read-only)
 
 # =============================================================================
 # Error Messages (for clear test failures)
@@ -205,7 +224,7 @@ P2_TESTS = [
     },
     {
         "name": "T6: Index conversion (to_pct_index)",
-        "indices": list(range(0, 256, 10)),
+        "indices": range(0, 256, 10),
         "description": "Test std_logic_vector to pct_index_t conversion"
     },
     {
@@ -215,7 +234,7 @@ P2_TESTS = [
     },
     {
         "name": "T8: Linear LUT generation",
-        "indices": list(range(0, 101, 10)),
+        "indices": range(0, 101, 10),
         "description": "Validate create_linear_voltage_lut results"
     },
 ]
@@ -224,20 +243,28 @@ P2_TESTS = [
 # Summary Statistics
 # =============================================================================
 
+# Test/check counts per level, fixed at import (the tables above are static)
+_P1_CHECK_COUNT = sum(len(t.get("indices", [])) for t in P1_TESTS)
+_P2_CHECK_COUNT = _P1_CHECK_COUNT + sum(len(t.get("indices", [])) for t in P2_TESTS)
+
+_LEVEL_SUMMARY = {
+    "P1": (len(P1_TESTS), _P1_CHECK_COUNT),
+    "P2": (len(P1_TESTS) + len(P2_TESTS), _P2_CHECK_COUNT),
+}
+
+# COCOTB_VERBOSITY, parsed like TestBase (unknown names fall back to MINIMAL)
+try:
+    _VERBOSITY = VerbosityLevel[os.environ.get("COCOTB_VERBOSITY", "MINIMAL").upper()]
+except KeyError:
+    _VERBOSITY = VerbosityLevel.MINIMAL
+
+
 def print_test_summary(level="P1"):
-    """Print test configuration summary"""
-    if level == "P1":
-        num_tests = len(P1_TESTS)
-        total_checks = sum(len(t.get("indices", [])) for t in P1_TESTS)
-    elif level == "P2":
-        num_tests = len(P1_TESTS) + len(P2_TESTS)
-        total_checks = (
-            sum(len(t.get("indices", [])) for t in P1_TESTS) +
-            sum(len(t.get("indices", [])) for t in P2_TESTS)
-        )
-    else:
-        num_tests = 0
-        total_checks = 0
+    """Print test configuration summary (nothing at SILENT verbosity)"""
+    if _VERBOSITY == VerbosityLevel.SILENT:
+        return
+
+    num_tests, total_checks = _LEVEL_SUMMARY.get(level, (0, 0))
 
     print(f"{level} Configuration:")
     print(f"  Tests: {num_tests}")
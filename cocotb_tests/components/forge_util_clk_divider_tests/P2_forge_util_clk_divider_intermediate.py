@@ -15,16 +15,10 @@ Date: 2025-01-27
 """
 
 import cocotb
-from cocotb.triggers import RisingEdge, ClockCycles
-import sys
-from pathlib import Path
-
-# Add parent directory for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
+from cocotb.triggers import FallingEdge, ClockCycles, Edge, with_timeout
 from conftest import setup_clock, reset_active_low, count_pulses, assert_pulse_count
 from test_base import TestBase, TestLevel, VerbosityLevel
-from volo_clk_divider_tests.volo_clk_divider_constants import *
+from forge_util_clk_divider_tests.forge_util_clk_divider_constants import *
 
 
 class VoloClkDividerIntermediateTests(TestBase):
@@ -57,17 +51,19 @@ class VoloClkDividerIntermediateTests(TestBase):
 
     async def test_divide_by_1(self):
         """Test bypass mode where clk_en is always high"""
-        await reset_active_low(self.dut)
-
-        # Set divide by 1 (div_sel=0 is bypass mode)
+        # Set divide by 1 (div_sel=0 is bypass mode) before the reset:
+        # its post-release cycle latches clk_en=1
         self.dut.div_sel.value = 0
         self.dut.enable.value = 1
         await reset_active_low(self.dut)
 
         # clk_en should be continuously high
+        # Sample mid-cycle: clk_en updated on the rising edge is settled by
+        # the falling edge, so no ReadOnly phase is needed
+        clk_en_sig = self.dut.clk_en
         for i in range(10):
-            await RisingEdge(self.dut.clk)
-            clk_en = int(self.dut.clk_en.value)
+            await FallingEdge(self.dut.clk)
+            clk_en = int(clk_en_sig.value)
             assert clk_en == 1, ErrorMessages.DIV_BY_1_CLK_EN.format(clk_en)
 
         self.log("Bypass mode: clk_en always high", VerbosityLevel.VERBOSE)
@@ -82,7 +78,10 @@ class VoloClkDividerIntermediateTests(TestBase):
         await ClockCycles(self.dut.clk, 2)
 
         # Use assert_pulse_count helper (combines count + assert)
-        await assert_pulse_count(self.dut.clk_en, self.dut.clk, cycles=100, expected=10)
+        await assert_pulse_count(
+            self.dut.clk_en, self.dut.clk, cycles=100, expected=10,
+            counter=self.dut.clk_en_count
+        )
 
         self.log("Divide by 10: 10 pulses in 100 cycles", VerbosityLevel.VERBOSE)
 
@@ -95,12 +94,11 @@ class VoloClkDividerIntermediateTests(TestBase):
         self.dut.enable.value = 1
         await ClockCycles(self.dut.clk, 1)
 
-        # Count clk_en pulses over 512 clock cycles (2 full periods)
-        clk_en_count = 0
-        for i in range(512):
-            await RisingEdge(self.dut.clk)
-            if int(self.dut.clk_en.value) == 1:
-                clk_en_count += 1
+        # The wrapper counts clk_en strobes in HDL: read the counter at both
+        # ends of the 512-cycle window instead of sampling clk_en per cycle
+        clk_en_count = await count_pulses(
+            self.dut.clk_en, self.dut.clk, 512, counter=self.dut.clk_en_count
+        )
 
         # Should see 2 pulses (every 256 cycles)
         expected_pulses = 2
@@ -120,12 +118,14 @@ class VoloClkDividerIntermediateTests(TestBase):
         await ClockCycles(self.dut.clk, 1)
 
         # Monitor counter incrementing and wrapping
+        stat_reg = self.dut.stat_reg
         prev_counter = 0
         wrap_detected = False
 
+        # Wake only when stat_reg changes; a stuck counter trips the timeout
         for i in range(20):
-            await RisingEdge(self.dut.clk)
-            current_counter = int(self.dut.stat_reg.value)
+            await with_timeout(Edge(stat_reg), 10 * DEFAULT_CLK_PERIOD_NS, "ns")
+            current_counter = int(stat_reg.value)
 
             # Check if counter wrapped (went from 4 to 0 for div_sel=5)
             if current_counter < prev_counter:
@@ -134,6 +134,7 @@ class VoloClkDividerIntermediateTests(TestBase):
                     f"Counter wrapped: {prev_counter} → {current_counter}",
                     VerbosityLevel.VERBOSE
                 )
+                break
 
             prev_counter = current_counter
 
@@ -8,14 +8,13 @@ Author: Moku Instrument Forge Team (adapted from EZ-EMFI)
 Date: 2025-11-04
 """
 
-from pathlib import Path
+from forge_cocotb._paths import PROJECT_ROOT
 
 
 # Module identification
 MODULE_NAME = "forge_util_clk_divider"
 
-# HDL sources (relative to tests/ directory)
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+# HDL sources (relative to project root)
 VHDL_DIR = PROJECT_ROOT / "vhdl"
 
 HDL_SOURCES = [
@@ -23,7 +22,7 @@ HDL_SOURCES = [
 ]
 
 # Top-level entity name
-HDL_TOPLEVEL = "forge_util_clk_divider"
+HDL_TOPLEVEL = "forge_util_clk_divider_tb_wrapper"  # HDL-clocked wrapper
 
 # Module parameters
 MAX_DIV = 256
@@ -15,13 +15,7 @@ Date: 2025-11-09
 """
 
 import cocotb
-from cocotb.triggers import RisingEdge, ClockCycles
-import sys
-from pathlib import Path
-
-# Import forge_cocotb infrastructure
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "python" / "forge_cocotb"))
-
+from cocotb.triggers import ClockCycles
 from forge_cocotb.test_base import TestBase, VerbosityLevel
 from forge_cocotb.conftest import setup_clock, reset_active_low
 from forge_util_edge_detector_pw_tests.edge_detector_pw_constants import *
@@ -30,6 +24,8 @@ from forge_util_edge_detector_pw_tests.edge_detector_pw_constants import *
 class EdgeDetectorPwBasicTests(TestBase):
     """P1 - BASIC tests: 4 essential tests only"""
 
+    GHDL_SETTLE_CYCLES = 2
+
     def __init__(self, dut):
         super().__init__(dut, MODULE_NAME)
 
@@ -38,6 +34,13 @@ class EdgeDetectorPwBasicTests(TestBase):
         await setup_clock(self.dut, period_ns=8)  # 125 MHz
         await reset_active_low(self.dut)
 
+        # Bind output handles once instead of resolving dut.<name> per read
+        self._rising = self.dut.rising_edge_out
+        self._falling = self.dut.falling_edge_out
+        self._rise_pw_max = self.dut.rise_pw_max
+        self._fall_pw_max = self.dut.fall_pw_max
+        self._probe3 = self.dut.probe3  # edge & rising & falling
+
     async def run_p1_basic(self):
         """P1 test suite entry point"""
         await self.setup()
@@ -50,13 +53,14 @@ class EdgeDetectorPwBasicTests(TestBase):
 
     async def test_reset(self):
         """Verify reset puts component in known state"""
-        # Wait 2 cycles (GHDL initialization bug workaround)
-        await ClockCycles(self.dut.clk, 2)
+        # GHDL initialization bug workaround (GHDL_SETTLE_CYCLES)
+        await self.settle()
 
-        # Check all outputs are cleared
-        edge_detected = get_edge_detected(self.dut)
-        rising_edge = get_rising_edge_out(self.dut)
-        falling_edge = get_falling_edge_out(self.dut)
+        # Check all outputs are cleared (one read of the packed probe)
+        probe = int(self._probe3.value)
+        edge_detected = (probe >> 2) & 1
+        rising_edge = (probe >> 1) & 1
+        falling_edge = probe & 1
 
         assert edge_detected == 0, ErrorMessages.WRONG_EDGE_DETECTED.format(0, edge_detected)
         assert rising_edge == 0, ErrorMessages.WRONG_RISING_EDGE.format(0, rising_edge)
@@ -69,28 +73,24 @@ class EdgeDetectorPwBasicTests(TestBase):
         # Setup: signal_in=0, enable=1
         self.dut.signal_in.value = 0
         self.dut.enable.value = 1
+        self.dut.pw_clear.value = 1
         await ClockCycles(self.dut.clk, 3)  # Wait for stability (GHDL quirks)
 
         # Stimulus: Rising edge (0→1)
+        self.dut.pw_clear.value = 0
         self.dut.signal_in.value = 1
 
-        # Wait for edge to register AND pulse to start (pipeline delay)
-        await ClockCycles(self.dut.clk, 2)
-
-        # Count pulse cycles (tolerant to ±1-2 cycles due to GHDL delta cycles)
-        # The pulse should already be active, count how long it stays high
-        pulse_count = 0
-        for _ in range(8):  # Observe 8 cycles (should see ~3 high)
-            if get_rising_edge_out(self.dut) == 1:
-                pulse_count += 1
-            await RisingEdge(self.dut.clk)
+        # Let the pulse run out (2 cycles pipeline + 8 observed); the wrapper
+        # captures its width in HDL, so read it once at the end
+        await ClockCycles(self.dut.clk, 10)
+        pulse_count = int(self._rise_pw_max.value)
 
         # GHDL-tolerant assertion: expect ~3 cycles (accept 2-4)
         # Widened tolerance to 1-5 to account for GHDL quirks
         assert 1 <= pulse_count <= 5, f"Expected pulse width 1-5 cycles (GHDL tolerance), got {pulse_count}"
 
         # Verify falling_edge_out stayed low (no falling edge)
-        assert get_falling_edge_out(self.dut) == 0, "No falling edge should occur"
+        assert int(self._falling.value) == 0, "No falling edge should occur"
 
         self.log(f"Rising edge: {pulse_count}-cycle pulse verified (target 3±2)", VerbosityLevel.VERBOSE)
 
@@ -99,28 +99,24 @@ class EdgeDetectorPwBasicTests(TestBase):
         # Setup: signal_in=1 (start high), enable=1
         self.dut.signal_in.value = 1
         self.dut.enable.value = 1
+        self.dut.pw_clear.value = 1
         await ClockCycles(self.dut.clk, 3)  # Wait for stability (GHDL quirks)
 
         # Stimulus: Falling edge (1→0)
+        self.dut.pw_clear.value = 0
         self.dut.signal_in.value = 0
 
-        # Wait for edge to register AND pulse to start (pipeline delay)
-        await ClockCycles(self.dut.clk, 2)
-
-        # Count pulse cycles (tolerant to ±1-2 cycles due to GHDL delta cycles)
-        # The pulse should already be active, count how long it stays high
-        pulse_count = 0
-        for _ in range(8):  # Observe 8 cycles (should see ~3 high)
-            if get_falling_edge_out(self.dut) == 1:
-                pulse_count += 1
-            await RisingEdge(self.dut.clk)
+        # Let the pulse run out (2 cycles pipeline + 8 observed); the wrapper
+        # captures its width in HDL, so read it once at the end
+        await ClockCycles(self.dut.clk, 10)
+        pulse_count = int(self._fall_pw_max.value)
 
         # GHDL-tolerant assertion: expect ~3 cycles (accept 1-5)
         # Widened tolerance to 1-5 to account for GHDL quirks
         assert 1 <= pulse_count <= 5, f"Expected pulse width 1-5 cycles (GHDL tolerance), got {pulse_count}"
 
         # Verify rising_edge_out stayed low (no rising edge)
-        assert get_rising_edge_out(self.dut) == 0, "No rising edge should occur"
+        assert int(self._rising.value) == 0, "No rising edge should occur"
 
         self.log(f"Falling edge: {pulse_count}-cycle pulse verified (target 3±2)", VerbosityLevel.VERBOSE)
 
@@ -134,25 +130,22 @@ class EdgeDetectorPwBasicTests(TestBase):
         # Edges while disabled (should be ignored)
         self.dut.signal_in.value = 1  # Rising edge
         await ClockCycles(self.dut.clk, 5)  # Observe for a while
-        assert get_rising_edge_out(self.dut) == 0, "Edge should be ignored when disabled"
+        assert int(self._rising.value) == 0, "Edge should be ignored when disabled"
 
         self.dut.signal_in.value = 0  # Falling edge
         await ClockCycles(self.dut.clk, 5)  # Observe for a while
-        assert get_falling_edge_out(self.dut) == 0, "Edge should be ignored when disabled"
+        assert int(self._falling.value) == 0, "Edge should be ignored when disabled"
 
         # Enable and create rising edge
         self.dut.enable.value = 1
+        self.dut.pw_clear.value = 1
         await ClockCycles(self.dut.clk, 2)  # Let enable settle
+        self.dut.pw_clear.value = 0
         self.dut.signal_in.value = 1  # Rising edge
-        await ClockCycles(self.dut.clk, 2)  # Wait for edge to register AND pulse to start
-
-        # Count pulse cycles (tolerant approach)
-        # The pulse should already be active, count how long it stays high
-        pulse_count = 0
-        for _ in range(8):  # Observe 8 cycles (should see ~3 high)
-            if get_rising_edge_out(self.dut) == 1:
-                pulse_count += 1
-            await RisingEdge(self.dut.clk)
+
+        # Let the pulse run out, then read its HDL-captured width once
+        await ClockCycles(self.dut.clk, 10)
+        pulse_count = int(self._rise_pw_max.value)
 
         # GHDL-tolerant assertion: expect ~3 cycles (accept 1-5)
         # Widened tolerance to 1-5 to account for GHDL quirks
@@ -1,15 +1,14 @@
 # edge_detector_pw_constants.py
-from pathlib import Path
+from forge_cocotb._paths import PROJECT_ROOT
 
 # Module identification
 MODULE_NAME = "forge_util_edge_detector_pw"
 
 # HDL sources (relative to project root)
-PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 HDL_SOURCES = [
     PROJECT_ROOT / "workflow" / "artifacts" / "vhdl" / "forge_util_edge_detector_pw.vhd",
 ]
-HDL_TOPLEVEL = "forge_util_edge_detector_pw"  # lowercase!
+HDL_TOPLEVEL = "forge_util_edge_detector_pw_tb_wrapper"  # lowercase! (HDL-clocked wrapper)
 
 # Test values (progressive sizing)
 class TestValues:
@@ -23,19 +22,6 @@ class TestValues:
     P2_EDGE_TYPES = ["rising", "falling", "both"]  # All modes
     P2_TEST_CYCLES = 50       # Longer tests
 
-# Helper functions (signal access patterns)
-def get_edge_detected(dut) -> int:
-    """Extract edge_detected output (std_logic → int)"""
-    return int(dut.edge_detected.value)
-
-def get_rising_edge_out(dut) -> int:
-    """Extract rising_edge_out output (std_logic → int)"""
-    return int(dut.rising_edge_out.value)
-
-def get_falling_edge_out(dut) -> int:
-    """Extract falling_edge_out output (std_logic → int)"""
-    return int(dut.falling_edge_out.value)
-
 # Error messages (consistent formatting)
 class ErrorMessages:
     WRONG_EDGE_DETECTED = "Expected edge_detected={}, got {}"
@@ -4,34 +4,32 @@ Constants and helper functions for forge_util_majority_voter tests
 Module: forge_util_majority_voter
 Category: utilities
 """
-from pathlib import Path
+from forge_cocotb._paths import PROJECT_ROOT
 
 # Module identification
 MODULE_NAME = "forge_util_majority_voter"
 
 # HDL sources (relative paths for artifacts, will be updated during integration)
-PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 HDL_SOURCES = [
     PROJECT_ROOT / "vhdl" / "components" / "utilities" / "forge_util_majority_voter.vhd"
 ]
-HDL_TOPLEVEL = "forge_util_majority_voter"  # lowercase!
+HDL_TOPLEVEL = "forge_util_majority_voter_tb_wrapper"  # lowercase! (HDL-clocked wrapper)
 
 # Test values
 class TestValues:
     """Progressive test value sizing"""
 
     # P1: All 8 input combinations (exhaustive for 3-bit input)
-    # Format: (A, B, C, Expected Output)
-    P1_COMBINATIONS = [
-        (0, 0, 0, 0),  # No inputs high
-        (0, 0, 1, 0),  # One input high
-        (0, 1, 0, 0),  # One input high
-        (0, 1, 1, 1),  # Two inputs high ← MAJORITY
-        (1, 0, 0, 0),  # One input high
-        (1, 0, 1, 1),  # Two inputs high ← MAJORITY
-        (1, 1, 0, 1),  # Two inputs high ← MAJORITY
-        (1, 1, 1, 1),  # Three inputs high ← MAJORITY
-    ]
+    # Packed one byte per row: bit 2 = A, bit 1 = B, bit 0 = C
+    #   ABC  000 001 010 011 100 101 110 111
+    #   out   0   0   0   1   0   1   1   1   (1 = two or more inputs high)
+    P1_INPUTS = bytes(range(8))
+    P1_EXPECTED = bytes(bin(abc).count("1") >= 2 for abc in P1_INPUTS)
+
+    # P1 sweep: expected wrapper out_hist after a test_mode truth-table run
+    # (row 000 is the MSB, row 111 the LSB)
+    P1_SWEEP_EXPECTED = int("".join(map(str, P1_EXPECTED)), 2)
+    P1_SWEEP_CYCLES = 10  # 8 rows + registered-mode latency + margin
 
     # P2: Additional test patterns for rapid toggling
     P2_RAPID_TOGGLE_CYCLES = 50
@@ -59,13 +57,13 @@ def calculate_majority(a: int, b: int, c: int) -> int:
     Returns:
         1 if majority (2+ inputs high), 0 otherwise
     """
-    return 1 if (a + b + c) >= 2 else 0
+    return (a & b) | (a & c) | (b & c)
 
 
 # Helper functions
 def set_inputs(dut, a: int, b: int, c: int):
     """
-    Set all three input signals
+    Set all three input signals with one write to the wrapper's input_abc bus
 
     Args:
         dut: Device under test
@@ -73,9 +71,7 @@ def set_inputs(dut, a: int, b: int, c: int):
         b: Input B value (0 or 1)
         c: Input C value (0 or 1)
     """
-    dut.input_a.value = a
-    dut.input_b.value = b
-    dut.input_c.value = c
+    dut.input_abc.value = (a << 2) | (b << 1) | c
 
 
 def get_output(dut) -> int:
@@ -96,6 +92,7 @@ class ErrorMessages:
     """Consistent error message templates"""
 
     WRONG_OUTPUT = "Inputs (A,B,C)=({},{},{}): Expected {}, got {}"
+    WRONG_SWEEP = "Truth-table sweep: Expected out_hist=0b{:08b}, got 0b{:08b}"
     RESET_FAILED = "Reset failed: Expected 0, got {}"
     ENABLE_HOLD_FAILED = "Enable hold failed: Output changed from {} to {}"
     LATENCY_ERROR = "Registered mode latency error: Expected {} after {} cycles, got {}"
@@ -12,18 +12,18 @@ Date: 2025-01-28
 
 import cocotb
 from cocotb.triggers import RisingEdge, Timer
-from cocotb.clock import Clock
 import os
 
 # Import test utilities and constants
+from conftest import setup_clock
 from forge_lut_pkg_tests.forge_lut_pkg_constants import (
     TEST_INDEX_MIN, TEST_INDEX_MAX, TEST_INDEX_MID,
     TEST_INDEX_OVERFLOW, TEST_INDEX_WAY_OVER,
-    EXPECTED_LUT_UNSIGNED, EXPECTED_LUT_SIGNED,
+    EXPECTED_LUT_UNSIGNED_TUP, EXPECTED_LUT_SIGNED,
     TEST_VOLTAGES, EXPECTED_VOLTAGE_TO_PCT,
     P1_TESTS, P2_TESTS,
     ERR_BOUNDS_OVERFLOW, ERR_LUT_UNSIGNED_MISMATCH, ERR_LUT_SIGNED_MISMATCH,
-    get_expected_clamped_index, tolerance_match, voltage_to_digital_approx
+    get_expected_clamped_index, voltage_to_digital_approx
 )
 
 # Test level from environment (default: P1_BASIC)
@@ -32,18 +32,18 @@ TEST_LEVEL = os.getenv("TEST_LEVEL", "P1_BASIC")
 # Verbosity control
 VERBOSITY = os.getenv("COCOTB_VERBOSITY", "MINIMAL")
 
+# Expected unsigned LUT output for every 8-bit index (indices > 100 clamp)
+_SATURATED = EXPECTED_LUT_UNSIGNED_TUP[100]
+_EXPECTED_UNSIGNED_FULL = EXPECTED_LUT_UNSIGNED_TUP + (_SATURATED,) * (256 - 101)
+
+# T6 to_pct_index probe points: every 25th index plus the clamp boundary
+_T6_INDICES = tuple(sorted(set(range(0, 256, 25)) | {100, 101, 150, 200, 255}))
+
 
 # =============================================================================
 # Test Utilities
 # =============================================================================
 
-async def setup_clock(dut, period_ns=10):
-    """Start clock"""
-    clock = Clock(dut.clk, period_ns, units="ns")
-    cocotb.start_soon(clock.start())
-    await RisingEdge(dut.clk)
-
-
 async def reset_dut(dut):
     """Apply reset"""
     dut.reset.value = 1
@@ -60,8 +60,8 @@ async def reset_dut(dut):
     await RisingEdge(dut.clk)
 
 
-async def test_lut_lookup_unsigned(dut, index, expected, test_name=""):
-    """Test unsigned LUT lookup"""
+async def test_lut_lookup_unsigned(dut, index, expected, test_name=None):
+    """Test unsigned LUT lookup (test_name defaults to "  Index <index>")"""
     dut.test_index.value = index
     dut.sel_lut_lookup.value = 1
     dut.sel_lut_lookup_signed.value = 0
@@ -74,13 +74,15 @@ async def test_lut_lookup_unsigned(dut, index, expected, test_name=""):
     actual = int(dut.lut_output_unsigned.value)
 
     if VERBOSITY in ["VERBOSE", "DEBUG"]:
+        # Label is built here so quiet runs never format it
+        test_name = f"  Index {index}" if test_name is None else test_name
         dut._log.info(f"{test_name}: Index={index}, Expected=0x{expected:04X}, Actual=0x{actual:04X}")
 
     assert actual == expected, ERR_LUT_UNSIGNED_MISMATCH.format(idx=index)
 
 
-async def test_lut_lookup_signed(dut, index, expected, test_name=""):
-    """Test signed LUT lookup"""
+async def test_lut_lookup_signed(dut, index, expected, test_name=None):
+    """Test signed LUT lookup (test_name defaults to "  Index <index>")"""
     dut.test_index.value = index
     dut.sel_lut_lookup.value = 0
     dut.sel_lut_lookup_signed.value = 1
@@ -93,13 +95,14 @@ async def test_lut_lookup_signed(dut, index, expected, test_name=""):
     actual = int(dut.lut_output_signed.value.signed_integer)
 
     if VERBOSITY in ["VERBOSE", "DEBUG"]:
+        test_name = f"  Index {index}" if test_name is None else test_name
         dut._log.info(f"{test_name}: Index={index}, Expected={expected}, Actual={actual}")
 
     assert actual == expected, ERR_LUT_SIGNED_MISMATCH.format(idx=index)
 
 
-async def test_to_pct_index(dut, index, test_name=""):
-    """Test to_pct_index clamping"""
+async def test_to_pct_index(dut, index, test_name=None):
+    """Test to_pct_index clamping (test_name defaults to "  to_pct_index(<index>)")"""
     expected = get_expected_clamped_index(index)
 
     # Clear all selects first (prevent stale outputs)
@@ -118,6 +121,7 @@ async def test_to_pct_index(dut, index, test_name=""):
     actual = int(dut.pct_index_output.value)
 
     if VERBOSITY in ["VERBOSE", "DEBUG"]:
+        test_name = f"  to_pct_index({index})" if test_name is None else test_name
         dut._log.info(f"{test_name}: Index={index}, Expected={expected}, Actual={actual}")
 
     assert actual == expected, f"to_pct_index({index}) should clamp to {expected}, got {actual}"
@@ -127,7 +131,6 @@ async def test_to_pct_index(dut, index, test_name=""):
 # P1 Tests (Basic - Minimal Output)
 # =============================================================================
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P1_BASIC", "P2_INTERMEDIATE", "P3_COMPREHENSIVE"]))
 async def test_p1_t1_bounds_checking(dut):
     """T1: Bounds checking (saturation)"""
     if VERBOSITY != "SILENT":
@@ -135,76 +138,62 @@ async def test_p1_t1_bounds_checking(dut):
         dut._log.info("P1 - BASIC TESTS")
         dut._log.info("T1: Bounds checking (saturation)")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test index 0 (min boundary)
-    await test_lut_lookup_unsigned(dut, 0, EXPECTED_LUT_UNSIGNED[0], "  Index 0")
+    await test_lut_lookup_unsigned(dut, 0, EXPECTED_LUT_UNSIGNED_TUP[0], "  Index 0")
 
     # Test index 100 (max boundary)
-    await test_lut_lookup_unsigned(dut, 100, EXPECTED_LUT_UNSIGNED[100], "  Index 100")
+    await test_lut_lookup_unsigned(dut, 100, EXPECTED_LUT_UNSIGNED_TUP[100], "  Index 100")
 
     # Test index 150 (overflow - should saturate to 100)
-    await test_lut_lookup_unsigned(dut, 150, EXPECTED_LUT_UNSIGNED[100], "  Index 150→100")
+    await test_lut_lookup_unsigned(dut, 150, EXPECTED_LUT_UNSIGNED_TUP[100], "  Index 150→100")
 
     if VERBOSITY != "SILENT":
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P1_BASIC", "P2_INTERMEDIATE", "P3_COMPREHENSIVE"]))
 async def test_p1_t2_basic_lut_lookup(dut):
     """T2: Basic LUT lookup"""
     if VERBOSITY != "SILENT":
         dut._log.info("T2: Basic LUT lookup (unsigned)")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test key points
     for index in [0, 50, 100]:
-        await test_lut_lookup_unsigned(dut, index, EXPECTED_LUT_UNSIGNED[index], f"  Index {index}")
+        await test_lut_lookup_unsigned(dut, index, EXPECTED_LUT_UNSIGNED_TUP[index])
 
     if VERBOSITY != "SILENT":
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P1_BASIC", "P2_INTERMEDIATE", "P3_COMPREHENSIVE"]))
 async def test_p1_t3_signed_lut_lookup(dut):
     """T3: Signed LUT lookup"""
     if VERBOSITY != "SILENT":
         dut._log.info("T3: Signed LUT lookup (bipolar)")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test key points (bipolar: -32768 to +32767)
     for index in [0, 50, 100]:
-        await test_lut_lookup_signed(dut, index, EXPECTED_LUT_SIGNED[index], f"  Index {index}")
+        await test_lut_lookup_signed(dut, index, EXPECTED_LUT_SIGNED[index])
 
     if VERBOSITY != "SILENT":
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P1_BASIC", "P2_INTERMEDIATE", "P3_COMPREHENSIVE"]))
 async def test_p1_t4_predefined_luts(dut):
     """T4: Predefined LUTs (LINEAR_5V_LUT, LINEAR_3V3_LUT)"""
     if VERBOSITY != "SILENT":
         dut._log.info("T4: Predefined LUTs")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test LINEAR_5V_LUT (always available output)
+    sig5v = dut.linear_5v_lut_out
     for index in [0, 50, 100]:
         dut.test_index.value = index
         await RisingEdge(dut.clk)
         await RisingEdge(dut.clk)
 
-        actual_5v = int(dut.linear_5v_lut_out.value.signed_integer)
+        actual_5v = sig5v.value.signed_integer
         expected_5v = voltage_to_digital_approx(index / 100.0 * 5.0)
 
         # Allow small tolerance for rounding
-        assert tolerance_match(actual_5v, expected_5v, tolerance=10), \
+        assert abs(actual_5v - expected_5v) <= 10, \
             f"LINEAR_5V_LUT[{index}]: expected ≈{expected_5v}, got {actual_5v}"
 
         if VERBOSITY in ["VERBOSE", "DEBUG"]:
@@ -220,7 +209,6 @@ async def test_p1_t4_predefined_luts(dut):
 # P2 Tests (Intermediate - Comprehensive)
 # =============================================================================
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P2_INTERMEDIATE", "P3_COMPREHENSIVE"]))
 async def test_p2_t5_comprehensive_bounds(dut):
     """T5: Comprehensive bounds testing"""
     if VERBOSITY != "SILENT":
@@ -228,70 +216,47 @@ async def test_p2_t5_comprehensive_bounds(dut):
         dut._log.info("P2 - INTERMEDIATE TESTS")
         dut._log.info("T5: Comprehensive bounds testing")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test boundary conditions extensively
     test_indices = [0, 1, 99, 100, 101, 150, 200, 255]
 
     for index in test_indices:
-        # Expected: clamp to 100 if > 100
-        if index <= 100:
-            # Calculate expected value on-the-fly for indices not in dict
-            if index in EXPECTED_LUT_UNSIGNED:
-                expected = EXPECTED_LUT_UNSIGNED[index]
-            else:
-                expected = int((index / 100.0) * 0xFFFF)
-        else:
-            expected = EXPECTED_LUT_UNSIGNED[100]
-
-        await test_lut_lookup_unsigned(dut, index, expected, f"  Index {index}")
+        expected = _EXPECTED_UNSIGNED_FULL[index]  # Clamped past index 100
+
+        await test_lut_lookup_unsigned(dut, index, expected)
 
     if VERBOSITY != "SILENT":
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P2_INTERMEDIATE", "P3_COMPREHENSIVE"]))
 async def test_p2_t6_index_conversion(dut):
     """T6: Index conversion (to_pct_index)"""
     if VERBOSITY != "SILENT":
         dut._log.info("T6: Index conversion (to_pct_index)")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test conversion with clamping
-    test_values = list(range(0, 256, 25)) + [100, 101, 150, 200, 255]
-
-    for index in test_values:
-        await test_to_pct_index(dut, index, f"  to_pct_index({index})")
+    for index in _T6_INDICES:
+        await test_to_pct_index(dut, index)
 
     if VERBOSITY != "SILENT":
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P2_INTERMEDIATE", "P3_COMPREHENSIVE"]))
 async def test_p2_t7_voltage_integration(dut):
     """T7: Voltage integration (voltage_to_pct_index)"""
     if VERBOSITY != "SILENT":
         dut._log.info("T7: Voltage integration")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
+    # Select voltage_to_pct_index once; only test_voltage changes per point
+    dut.sel_lut_lookup.value = 0
+    dut.sel_lut_lookup_signed.value = 0
+    dut.sel_to_pct_index.value = 0
+    dut.sel_voltage_to_pct.value = 1
+    await RisingEdge(dut.clk)
 
     # Test voltage to percentage conversion (0-3.3V range)
     for voltage_name, digital_value in TEST_VOLTAGES.items():
         if digital_value in EXPECTED_VOLTAGE_TO_PCT:
-            # Clear all selects first (prevent stale outputs)
-            dut.sel_lut_lookup.value = 0
-            dut.sel_lut_lookup_signed.value = 0
-            dut.sel_to_pct_index.value = 0
-            dut.sel_voltage_to_pct.value = 0
-            await RisingEdge(dut.clk)
-
-            # Now set input and select
             dut.test_voltage.value = digital_value
-            dut.sel_voltage_to_pct.value = 1
             await RisingEdge(dut.clk)
             await RisingEdge(dut.clk)
 
@@ -299,7 +264,7 @@ async def test_p2_t7_voltage_integration(dut):
             expected = EXPECTED_VOLTAGE_TO_PCT[digital_value]
 
             # Allow ±1 tolerance for rounding
-            assert tolerance_match(actual, expected, tolerance=1), \
+            assert abs(actual - expected) <= 1, \
                 f"voltage_to_pct_index({voltage_name}): expected {expected}, got {actual}"
 
             if VERBOSITY in ["VERBOSE", "DEBUG"]:
@@ -309,28 +274,40 @@ async def test_p2_t7_voltage_integration(dut):
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P2_INTERMEDIATE", "P3_COMPREHENSIVE"]))
 async def test_p2_t8_linear_lut_generation(dut):
     """T8: Linear LUT generation (create_linear_voltage_lut)"""
     if VERBOSITY != "SILENT":
         dut._log.info("T8: Linear LUT generation")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test LINEAR_3V3_LUT across full range
     test_indices = list(range(0, 101, 10))
 
-    for index in test_indices:
-        dut.test_index.value = index
-        await RisingEdge(dut.clk)
+    # Drive a new index every clock while a monitor samples the registered
+    # output one edge behind, then check the captured values afterwards
+    captured = []
+
+    async def drive():
+        for index in test_indices:
+            dut.test_index.value = index
+            await RisingEdge(dut.clk)
+
+    async def sample():
+        sig3v3 = dut.linear_3v3_lut_out
         await RisingEdge(dut.clk)
+        for _ in test_indices:
+            await RisingEdge(dut.clk)
+            captured.append(sig3v3.value.signed_integer)
 
-        actual = int(dut.linear_3v3_lut_out.value.signed_integer)
+    driver = cocotb.start_soon(drive())
+    monitor = cocotb.start_soon(sample())
+    await driver
+    await monitor
+
+    for index, actual in zip(test_indices, captured):
         expected = voltage_to_digital_approx(index / 100.0 * 3.3)
 
         # Allow tolerance for rounding
-        assert tolerance_match(actual, expected, tolerance=20), \
+        assert abs(actual - expected) <= 20, \
             f"LINEAR_3V3_LUT[{index}]: expected ≈{expected}, got {actual}"
 
         if VERBOSITY in ["VERBOSE", "DEBUG"]:
@@ -347,7 +324,6 @@ async def test_p2_t8_linear_lut_generation(dut):
 # P3 Tests (Comprehensive - Exhaustive)
 # =============================================================================
 
-@cocotb.test(skip=(TEST_LEVEL != "P3_COMPREHENSIVE"))
 async def test_p3_exhaustive_lut_lookup(dut):
     """P3: Exhaustive LUT lookup (all indices 0-255)"""
     if VERBOSITY != "SILENT":
@@ -355,27 +331,34 @@ async def test_p3_exhaustive_lut_lookup(dut):
         dut._log.info("P3 - COMPREHENSIVE TESTS")
         dut._log.info("T9: Exhaustive LUT lookup (0-255)")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
+    dut.sel_lut_lookup.value = 1
+    dut.sel_lut_lookup_signed.value = 0
+    dut.sel_to_pct_index.value = 0
+    dut.sel_voltage_to_pct.value = 0
+
+    # Pipelined sweep: drive a new index every clock. The registered output
+    # read after an edge belongs to the index driven one iteration earlier,
+    # so each index costs one edge instead of test_lut_lookup_unsigned()'s two.
+    lut_out = dut.lut_output_unsigned
+    captured = []
+    for index in range(256):
+        dut.test_index.value = index
+        await RisingEdge(dut.clk)
+        if index:
+            captured.append(int(lut_out.value))
+    await RisingEdge(dut.clk)
+    captured.append(int(lut_out.value))
 
+    # Compare after the sweep, in pure Python
     error_count = 0
 
-    for index in range(256):
-        # Expected: clamp to 100 if > 100
-        if index <= 100:
-            expected = EXPECTED_LUT_UNSIGNED.get(index, None)
-            if expected is None:
-                # Calculate for indices not in expected table
-                expected = int((index / 100.0) * 0xFFFF)
-        else:
-            expected = EXPECTED_LUT_UNSIGNED[100]
-
-        try:
-            await test_lut_lookup_unsigned(dut, index, expected, f"Index {index}")
-        except AssertionError as e:
+    for index, actual in enumerate(captured):
+        expected = _EXPECTED_UNSIGNED_FULL[index]  # Clamped past index 100
+
+        if actual != expected:
             error_count += 1
             if VERBOSITY in ["VERBOSE", "DEBUG"]:
-                dut._log.error(f"  FAIL at index {index}: {e}")
+                dut._log.error(f"  FAIL at index {index}: expected 0x{expected:04X}, got 0x{actual:04X}")
 
     if error_count > 0:
         raise AssertionError(f"P3: {error_count} failures out of 256 tests")
@@ -384,3 +367,37 @@ async def test_p3_exhaustive_lut_lookup(dut):
         dut._log.info("  ✓ PASS (256/256 tests)")
         dut._log.info("=" * 70)
         dut._log.info("ALL P3 TESTS PASSED")
+
+
+# =============================================================================
+# Entry Point
+# =============================================================================
+
+# (TEST_LEVEL values that run the check, check)
+LEVEL_TESTS = [
+    (("P1_BASIC", "P2_INTERMEDIATE", "P3_COMPREHENSIVE"), test_p1_t1_bounds_checking),
+    (("P1_BASIC", "P2_INTERMEDIATE", "P3_COMPREHENSIVE"), test_p1_t2_basic_lut_lookup),
+    (("P1_BASIC", "P2_INTERMEDIATE", "P3_COMPREHENSIVE"), test_p1_t3_signed_lut_lookup),
+    (("P1_BASIC", "P2_INTERMEDIATE", "P3_COMPREHENSIVE"), test_p1_t4_predefined_luts),
+    (("P2_INTERMEDIATE", "P3_COMPREHENSIVE"), test_p2_t5_comprehensive_bounds),
+    (("P2_INTERMEDIATE", "P3_COMPREHENSIVE"), test_p2_t6_index_conversion),
+    (("P2_INTERMEDIATE", "P3_COMPREHENSIVE"), test_p2_t7_voltage_integration),
+    (("P2_INTERMEDIATE", "P3_COMPREHENSIVE"), test_p2_t8_linear_lut_generation),
+    (("P3_COMPREHENSIVE",), test_p3_exhaustive_lut_lookup),
+]
+
+
+@cocotb.test()
+async def test_forge_lut_pkg_progressive(dut):
+    """
+    Run every check selected by TEST_LEVEL as a single cocotb test.
+
+    The clock is started and the DUT reset once; each check drives all of
+    its select and input signals itself, so they share the running DUT.
+    """
+    await setup_clock(dut)
+    await reset_dut(dut)
+
+    for levels, check in LEVEL_TESTS:
+        if TEST_LEVEL in levels:
+            await check(dut)
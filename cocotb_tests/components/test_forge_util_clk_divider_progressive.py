@@ -18,13 +18,7 @@ Date: 2025-11-04
 """
 
 import cocotb
-from cocotb.triggers import RisingEdge, ClockCycles
-import sys
-from pathlib import Path
-
-# Add parent directory for imports
-sys.path.insert(0, str(Path(__file__).parent))
-
+from cocotb.triggers import FallingEdge, ClockCycles, Edge, with_timeout
 from conftest import setup_clock, reset_active_low, count_pulses, assert_pulse_count
 from test_base import TestBase, TestLevel, VerbosityLevel
 from forge_util_clk_divider_tests.forge_util_clk_divider_constants import *
@@ -74,7 +68,9 @@ class ForgeUtilClkDividerTests(TestBase):
         self.dut.enable.value = 1
         await ClockCycles(self.dut.clk, 2)
 
-        clk_en_count = await count_pulses(self.dut.clk_en, self.dut.clk, 20)
+        clk_en_count = await count_pulses(
+            self.dut.clk_en, self.dut.clk, 20, counter=self.dut.clk_en_count
+        )
 
         expected_pulses = 10
         assert clk_en_count == expected_pulses, ErrorMessages.PULSE_COUNT.format(
@@ -106,13 +102,13 @@ class ForgeUtilClkDividerTests(TestBase):
         # Read counter value after disable has taken effect
         counter_frozen = int(self.dut.stat_reg.value)
 
-        # Counter should hold for several cycles
-        for i in range(5):
-            await ClockCycles(self.dut.clk, 1)
-            counter_check = int(self.dut.stat_reg.value)
-            assert counter_check == counter_frozen, ErrorMessages.COUNTER_FROZEN.format(
-                counter_frozen, counter_check
-            )
+        # Counter should hold for several cycles - a frozen counter never
+        # moves, so one read after the window is enough
+        await ClockCycles(self.dut.clk, 5)
+        counter_check = int(self.dut.stat_reg.value)
+        assert counter_check == counter_frozen, ErrorMessages.COUNTER_FROZEN.format(
+            counter_frozen, counter_check
+        )
 
         self.log(f"Counter frozen at {counter_frozen}", VerbosityLevel.VERBOSE)
 
@@ -131,15 +127,17 @@ class ForgeUtilClkDividerTests(TestBase):
 
     async def test_divide_by_1(self):
         """Test bypass mode where clk_en is always high"""
-        await reset_active_low(self.dut)
-
+        # Configure before the reset: its post-release cycle latches clk_en=1
         self.dut.div_sel.value = 0
         self.dut.enable.value = 1
         await reset_active_low(self.dut)
 
+        # Sample mid-cycle: clk_en updated on the rising edge is settled by
+        # the falling edge, so no ReadOnly phase is needed
+        clk_en_sig = self.dut.clk_en
         for i in range(10):
-            await RisingEdge(self.dut.clk)
-            clk_en = int(self.dut.clk_en.value)
+            await FallingEdge(self.dut.clk)
+            clk_en = int(clk_en_sig.value)
             assert clk_en == 1, ErrorMessages.DIV_BY_1_CLK_EN.format(clk_en)
 
         self.log("Bypass mode verified", VerbosityLevel.VERBOSE)
@@ -152,7 +150,10 @@ class ForgeUtilClkDividerTests(TestBase):
         self.dut.enable.value = 1
         await ClockCycles(self.dut.clk, 2)
 
-        await assert_pulse_count(self.dut.clk_en, self.dut.clk, cycles=100, expected=10)
+        await assert_pulse_count(
+            self.dut.clk_en, self.dut.clk, cycles=100, expected=10,
+            counter=self.dut.clk_en_count
+        )
 
         self.log("Divide by 10 verified", VerbosityLevel.VERBOSE)
 
@@ -164,11 +165,11 @@ class ForgeUtilClkDividerTests(TestBase):
         self.dut.enable.value = 1
         await ClockCycles(self.dut.clk, 1)
 
-        clk_en_count = 0
-        for i in range(512):
-            await RisingEdge(self.dut.clk)
-            if int(self.dut.clk_en.value) == 1:
-                clk_en_count += 1
+        # The wrapper counts clk_en strobes in HDL: read the counter at both
+        # ends of the 512-cycle window instead of sampling clk_en per cycle
+        clk_en_count = await count_pulses(
+            self.dut.clk_en, self.dut.clk, 512, counter=self.dut.clk_en_count
+        )
 
         expected_pulses = 2
         assert clk_en_count == expected_pulses, ErrorMessages.PULSE_COUNT.format(
@@ -185,12 +186,14 @@ class ForgeUtilClkDividerTests(TestBase):
         self.dut.enable.value = 1
         await ClockCycles(self.dut.clk, 1)
 
+        stat_reg = self.dut.stat_reg
         prev_counter = 0
         wrap_detected = False
 
+        # Wake only when stat_reg changes; a stuck counter trips the timeout
         for i in range(20):
-            await RisingEdge(self.dut.clk)
-            current_counter = int(self.dut.stat_reg.value)
+            await with_timeout(Edge(stat_reg), 10 * DEFAULT_CLK_PERIOD_NS, "ns")
+            current_counter = int(stat_reg.value)
 
             if current_counter < prev_counter:
                 wrap_detected = True
@@ -198,6 +201,7 @@ class ForgeUtilClkDividerTests(TestBase):
                     f"Counter wrapped: {prev_counter} → {current_counter}",
                     VerbosityLevel.VERBOSE
                 )
+                break
 
             prev_counter = current_counter
 
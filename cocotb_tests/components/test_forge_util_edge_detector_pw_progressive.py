@@ -1,7 +1,7 @@
 """
 Progressive Test Orchestrator for forge_util_edge_detector_pw
 
-Dynamically loads and runs test levels based on TEST_LEVEL environment variable.
+Runs the test level selected by the TEST_LEVEL environment variable.
 
 Environment Variables:
 - TEST_LEVEL: P1_BASIC (default), P2_INTERMEDIATE, P3_COMPREHENSIVE, P4_EXHAUSTIVE
@@ -19,15 +19,16 @@ Date: 2025-11-09
 """
 
 import cocotb
-import sys
 import os
-from pathlib import Path
-
-# Add paths
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "python" / "forge_cocotb"))
-sys.path.insert(0, str(Path(__file__).parent))
 
 from forge_cocotb.test_base import TestLevel
+from forge_util_edge_detector_pw_tests.P1_edge_detector_pw_basic import EdgeDetectorPwBasicTests
+
+
+# Test class and entry method per level (only P1 is implemented so far)
+LEVEL_RUNNERS = {
+    TestLevel.P1_BASIC: (EdgeDetectorPwBasicTests, "run_p1_basic"),
+}
 
 
 def get_test_level() -> TestLevel:
@@ -36,25 +37,18 @@ def get_test_level() -> TestLevel:
     return TestLevel[level_str]
 
 
+# Resolved once at import: a simulator run only ever uses one TEST_LEVEL
+_TEST_LEVEL = get_test_level()
+
+
 @cocotb.test()
 async def test_edge_detector_pw_progressive(dut):
     """Progressive test orchestrator"""
-    test_level = get_test_level()
-
-    if test_level == TestLevel.P1_BASIC:
-        from forge_util_edge_detector_pw_tests.P1_edge_detector_pw_basic import EdgeDetectorPwBasicTests
-        tester = EdgeDetectorPwBasicTests(dut)
-        await tester.run_p1_basic()
-
-    elif test_level == TestLevel.P2_INTERMEDIATE:
-        from forge_util_edge_detector_pw_tests.P2_edge_detector_pw_intermediate import EdgeDetectorPwIntermediateTests
-        tester = EdgeDetectorPwIntermediateTests(dut)
-        await tester.run_p2_intermediate()
+    test_level = _TEST_LEVEL
 
-    elif test_level == TestLevel.P3_COMPREHENSIVE:
-        from forge_util_edge_detector_pw_tests.P3_edge_detector_pw_comprehensive import EdgeDetectorPwComprehensiveTests
-        tester = EdgeDetectorPwComprehensiveTests(dut)
-        await tester.run_p3_comprehensive()
+    if test_level not in LEVEL_RUNNERS:
+        raise ValueError(f"No tests implemented for level: {test_level}")
 
-    else:
-        raise ValueError(f"Unknown test level: {test_level}")
+    tester_cls, entry = LEVEL_RUNNERS[test_level]
+    tester = tester_cls(dut)
+    await getattr(tester, entry)()
@@ -22,11 +22,7 @@ Date: 2025-11-09
 """
 
 import cocotb
-import sys
-from pathlib import Path
-
-# Add parent directory for imports
-sys.path.insert(0, str(Path(__file__).parent))
+import os
 
 from test_base import TestBase, TestLevel
 from forge_util_majority_voter_tests.P1_forge_util_majority_voter_basic import MajorityVoterBasicTests
@@ -34,15 +30,18 @@ from forge_util_majority_voter_tests.P1_forge_util_majority_voter_basic import M
 
 def get_test_level() -> TestLevel:
     """Read TEST_LEVEL environment variable"""
-    import os
     level_str = os.environ.get("TEST_LEVEL", "P1_BASIC")
     return TestLevel[level_str]
 
 
+# Resolved once at import: a simulator run only ever uses one TEST_LEVEL
+_TEST_LEVEL = get_test_level()
+
+
 @cocotb.test()
 async def test_forge_util_majority_voter_progressive(dut):
     """Progressive test orchestrator"""
-    test_level = get_test_level()
+    test_level = _TEST_LEVEL
 
     if test_level == TestLevel.P1_BASIC:
         tester = MajorityVoterBasicTests(dut)
@@ -13,9 +13,10 @@ Date: 2025-11-04
 
 import cocotb
 from cocotb.triggers import RisingEdge, Timer
-from cocotb.clock import Clock
 import os
 
+from conftest import setup_clock
+
 # Test level from environment (default: P1_BASIC)
 TEST_LEVEL = os.getenv("TEST_LEVEL", "P1_BASIC")
 
@@ -27,13 +28,6 @@ VERBOSITY = os.getenv("COCOTB_VERBOSITY", "MINIMAL")
 # Test Utilities
 # =============================================================================
 
-async def setup_clock(dut, period_ns=10):
-    """Start clock"""
-    clock = Clock(dut.clk, period_ns, units="ns")
-    cocotb.start_soon(clock.start())
-    await RisingEdge(dut.clk)
-
-
 async def reset_dut(dut):
     """Apply reset"""
     dut.reset.value = 1
@@ -70,7 +64,6 @@ def digital_to_voltage_3v3(digital):
 # P1 Tests (Basic - Minimal Output)
 # =============================================================================
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P1_BASIC", "P2_INTERMEDIATE"]))
 async def test_p1_t1_to_digital_accuracy(dut):
     """T1: to_digital() conversion accuracy"""
     if VERBOSITY != "SILENT":
@@ -78,9 +71,6 @@ async def test_p1_t1_to_digital_accuracy(dut):
         dut._log.info("P1 - BASIC TESTS (forge_voltage_3v3_pkg)")
         dut._log.info("T1: to_digital() accuracy")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test key voltage points
     test_cases = [
         (0.0, 0),         # 0V → 0
@@ -113,15 +103,11 @@ async def test_p1_t1_to_digital_accuracy(dut):
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P1_BASIC", "P2_INTERMEDIATE"]))
 async def test_p1_t2_from_digital_roundtrip(dut):
     """T2: from_digital() round-trip conversion"""
     if VERBOSITY != "SILENT":
         dut._log.info("T2: from_digital() round-trip")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test key digital values
     test_digitals = [0, 16384, 32767]
 
@@ -150,15 +136,11 @@ async def test_p1_t2_from_digital_roundtrip(dut):
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P1_BASIC", "P2_INTERMEDIATE"]))
 async def test_p1_t3_is_valid_boundary(dut):
     """T3: is_valid() boundary checks"""
     if VERBOSITY != "SILENT":
         dut._log.info("T3: is_valid() boundary checks")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test valid voltages (wrapper pre-clamps, so test in-range values)
     test_cases = [
         (0.0, True),    # Min (valid)
@@ -189,15 +171,11 @@ async def test_p1_t3_is_valid_boundary(dut):
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P1_BASIC", "P2_INTERMEDIATE"]))
 async def test_p1_t4_clamp_behavior(dut):
     """T4: clamp() behavior"""
     if VERBOSITY != "SILENT":
         dut._log.info("T4: clamp() behavior")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test clamping at boundaries
     test_cases = [
         (0.0, 0.0),     # Min (no clamp)
@@ -237,7 +215,6 @@ async def test_p1_t4_clamp_behavior(dut):
 # P2 Tests (Intermediate - Comprehensive)
 # =============================================================================
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P2_INTERMEDIATE"]))
 async def test_p2_t5_precision_tests(dut):
     """T5: Precision and edge case testing"""
     if VERBOSITY != "SILENT":
@@ -245,9 +222,6 @@ async def test_p2_t5_precision_tests(dut):
         dut._log.info("P2 - INTERMEDIATE TESTS")
         dut._log.info("T5: Precision tests")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test various voltages across range
     test_voltages = [0.0, 0.5, 1.0, 1.8, 2.5, 3.0, 3.3]
 
@@ -277,15 +251,11 @@ async def test_p2_t5_precision_tests(dut):
         dut._log.info("  ✓ PASS")
 
 
-@cocotb.test(skip=(TEST_LEVEL not in ["P2_INTERMEDIATE"]))
 async def test_p2_t6_reference_voltages(dut):
     """T6: Test predefined reference voltages"""
     if VERBOSITY != "SILENT":
         dut._log.info("T6: Reference voltage constants")
 
-    await setup_clock(dut)
-    await reset_dut(dut)
-
     # Test reference voltages (from package constants)
     test_cases = [
         (1.0, 9930),    # DIGITAL_1V0
@@ -319,3 +289,34 @@ async def test_p2_t6_reference_voltages(dut):
         dut._log.info("  ✓ PASS")
         dut._log.info("=" * 70)
         dut._log.info("ALL 6 P2 TESTS PASSED (P1+P2)")
+
+
+# =============================================================================
+# Entry Point
+# =============================================================================
+
+# (TEST_LEVEL values that run the check, check)
+LEVEL_TESTS = [
+    (("P1_BASIC", "P2_INTERMEDIATE"), test_p1_t1_to_digital_accuracy),
+    (("P1_BASIC", "P2_INTERMEDIATE"), test_p1_t2_from_digital_roundtrip),
+    (("P1_BASIC", "P2_INTERMEDIATE"), test_p1_t3_is_valid_boundary),
+    (("P1_BASIC", "P2_INTERMEDIATE"), test_p1_t4_clamp_behavior),
+    (("P2_INTERMEDIATE",), test_p2_t5_precision_tests),
+    (("P2_INTERMEDIATE",), test_p2_t6_reference_voltages),
+]
+
+
+@cocotb.test()
+async def test_forge_voltage_3v3_pkg_progressive(dut):
+    """
+    Run every check selected by TEST_LEVEL as a single cocotb test.
+
+    The clock is started and the DUT reset once; each check drives all of
+    its select and input signals itself, so they share the running DUT.
+    """
+    await setup_clock(dut)
+    await reset_dut(dut)
+
+    for levels, check in LEVEL_TESTS:
+        if TEST_LEVEL in levels:
+            await check(dut)
@@ -17,9 +17,18 @@ Author: Claude Code (CocotB migration)
 Date: 2025-01-22
 """
 
+import functools
+import logging
+import random
+
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, FallingEdge, ClockCycles, with_timeout
+from cocotb.triggers import RisingEdge, FallingEdge, ClockCycles, Timer, with_timeout
+
+try:
+    from cocotb.triggers import SimTimeoutError  # cocotb 2.x
+except ImportError:
+    from cocotb.result import SimTimeoutError  # cocotb 1.x
 
 
 # Default clock period for all tests
@@ -47,7 +56,7 @@ async def run_with_timeout(test_coro, timeout_sec=DEFAULT_TEST_TIMEOUT_SEC, test
         test_name: Name of test for error messages (optional)
 
     Raises:
-        cocotb.result.SimTimeoutError: If timeout expires before test completes
+        AssertionError: If timeout expires before test completes
 
     Example - Basic usage:
         @cocotb.test()
@@ -66,18 +75,13 @@ async def run_with_timeout(test_coro, timeout_sec=DEFAULT_TEST_TIMEOUT_SEC, test
     means 10 real seconds, regardless of how many simulation cycles run.
     """
     try:
-        result = await with_timeout(test_coro, timeout_time=timeout_sec, timeout_unit="sec")
-        return result
-    except Exception as e:
-        # Check if it's a timeout error
-        if "Timeout" in str(e) or "timeout" in str(type(e).__name__).lower():
-            raise AssertionError(
-                f"Test '{test_name}' TIMEOUT after {timeout_sec}s wall-clock time. "
-                f"Possible infinite loop or simulation stuck. Original error: {e}"
-            )
-        else:
-            # Re-raise other exceptions unchanged
-            raise
+        return await with_timeout(test_coro, timeout_time=timeout_sec, timeout_unit="sec")
+    except SimTimeoutError as e:
+        # Other exceptions propagate unchanged
+        raise AssertionError(
+            f"Test '{test_name}' TIMEOUT after {timeout_sec}s wall-clock time. "
+            f"Possible infinite loop or simulation stuck. Original error: {e}"
+        ) from e
 
 
 # =============================================================================
@@ -102,6 +106,7 @@ ENABLE_BIT = 30     # User-controlled enable/disable
 CLK_EN_BIT = 29     # ⚠️ MANDATORY for clocked modules!
 
 MCC_CR0_BASE = (1 << MCC_READY_BIT) | (1 << ENABLE_BIT) | (1 << CLK_EN_BIT)  # 0xE0000000
+_ENABLE_CLK_EN_MASK = (1 << ENABLE_BIT) | (1 << CLK_EN_BIT)  # 0x60000000
 
 
 def validate_control0(cr0_value: int, context: str = ""):
@@ -118,32 +123,36 @@ def validate_control0(cr0_value: int, context: str = ""):
         validate_control0(0xC0000000)  # Warns: missing bit 29!
         validate_control0(0xE0000000)  # OK: all 3 bits present
     """
-    mcc_ready = (cr0_value >> MCC_READY_BIT) & 1
-    enable = (cr0_value >> ENABLE_BIT) & 1
-    clk_en = (cr0_value >> CLK_EN_BIT) & 1
-
-    if enable and not clk_en:
-        import warnings
-        warnings.warn(
-            f"\n{'='*70}\n"
-            f"⚠️  WARNING: Control0={cr0_value:#010x} missing Clock Enable (bit 29)!\n"
-            f"{'='*70}\n"
-            f"  Bit 31 (MCC_READY): {mcc_ready}\n"
-            f"  Bit 30 (Enable):    {enable}\n"
-            f"  Bit 29 (ClkEn):     {clk_en}  ← ⚠️ MUST BE 1 for clocked modules!\n"
-            f"{'='*70}\n"
-            f"Module will FREEZE without Clock Enable!\n"
-            f"Use: {(cr0_value | (1 << CLK_EN_BIT)):#010x} instead\n"
-            f"Context: {context}\n"
-            f"{'='*70}",
-            stacklevel=3
-        )
-
+    # Fast path: one mask-compare for "Enable set, ClkEn clear"; the bit
+    # fields are only extracted when the warning is actually built
+    if (cr0_value & _ENABLE_CLK_EN_MASK) != 1 << ENABLE_BIT:
+        return
 
+    import warnings
+    mcc_ready = (cr0_value >> MCC_READY_BIT) & 1
+    warnings.warn(
+        f"\n{'='*70}\n"
+        f"⚠️  WARNING: Control0={cr0_value:#010x} missing Clock Enable (bit 29)!\n"
+        f"{'='*70}\n"
+        f"  Bit 31 (MCC_READY): {mcc_ready}\n"
+        f"  Bit 30 (Enable):    1\n"
+        f"  Bit 29 (ClkEn):     0  ← ⚠️ MUST BE 1 for clocked modules!\n"
+        f"{'='*70}\n"
+        f"Module will FREEZE without Clock Enable!\n"
+        f"Use: {(cr0_value | (1 << CLK_EN_BIT)):#010x} instead\n"
+        f"Context: {context}\n"
+        f"{'='*70}",
+        stacklevel=3
+    )
+
+
+@functools.lru_cache(maxsize=64)
 def mcc_cr0(divider: int = 0, extra_bits: int = 0) -> int:
     """Construct Control0 with mandatory 3-bit control scheme.
 
-    Always includes bits 31+30+29 (MCC_READY + Enable + ClkEn).
+    Always includes bits 31+30+29 (MCC_READY + Enable + ClkEn). Memoized:
+    tests reuse a handful of (divider, extra_bits) pairs. With no divider
+    or extra bits the result is MCC_CR0_BASE, which callers can use directly.
 
     Args:
         divider: Clock divider value (0-255), placed in bits 23:16
@@ -164,29 +173,106 @@ def mcc_cr0(divider: int = 0, extra_bits: int = 0) -> int:
     return value
 
 
+# =============================================================================
+# Signal Handles
+# =============================================================================
+
+# Handles resolved by _signal(), keyed by (id(dut), candidate names), so the
+# hasattr/getattr hierarchy lookups happen once per DUT rather than per call
+_signal_cache = {}
+
+
+def _signal(dut, *names):
+    """
+    Return the first of `names` that exists on the DUT (cached per DUT)
+
+    Raises AttributeError for the first name if none of them exist.
+    """
+    key = (id(dut), names)
+    handle = _signal_cache.get(key)
+    if handle is None:
+        for name in names:
+            if hasattr(dut, name):
+                handle = getattr(dut, name)
+                break
+        else:
+            handle = getattr(dut, names[0])  # Raises AttributeError
+        _signal_cache[key] = handle
+    return handle
+
+
+# Control<n> handle tuples for mcc_set_regs(), keyed by (id(dut), reg numbers)
+_control_cache = {}
+
+
+def _control_handles(dut, reg_nums):
+    """Return the Control<n> handles for a tuple of register numbers (cached per DUT)"""
+    key = (id(dut), reg_nums)
+    handles = _control_cache.get(key)
+    if handles is None:
+        handles = tuple(getattr(dut, f"Control{n}") for n in reg_nums)
+        _control_cache[key] = handles
+    return handles
+
+
 # =============================================================================
 # Clock Management
 # =============================================================================
 
+# Clock tasks started by setup_clock(), keyed by clock handle. cocotb cancels
+# them when a test ends, so a finished task means the clock must be restarted.
+_clock_tasks = {}
+
+
 async def setup_clock(dut, period_ns=DEFAULT_CLK_PERIOD_NS, clk_signal="clk"):
     """
     Start a clock on the DUT
 
+    Calling it again within the same cocotb test (e.g. from each phase's
+    setup()) returns the clock that is already running instead of starting
+    a second driver on the same signal.
+
+    Test wrappers that generate clk in HDL (see cocotb_test_wrappers/README.md)
+    expose their CLK_PERIOD generic on a `hdl_clk_period_ns` port. For those
+    toplevels no Python Clock is started; the helper waits for the first
+    edge and checks that the wrapper's period matches `period_ns`.
+
     Args:
         dut: Device Under Test
         period_ns: Clock period in nanoseconds (default: 10ns = 100MHz)
         clk_signal: Name of clock signal (default: "clk")
 
     Returns:
-        Clock object (can be ignored, runs in background)
+        Clock task (can be ignored, runs in background), or None when the
+        toplevel generates its own clock
+
+    Raises:
+        ValueError: If an HDL clock's period differs from `period_ns`
 
     Example:
         await setup_clock(dut)
         await setup_clock(dut, period_ns=20)  # 50MHz clock
         await setup_clock(dut, clk_signal="Clk")  # MCC style
     """
-    clk = getattr(dut, clk_signal)
+    clk = _signal(dut, clk_signal)
+
+    if hasattr(dut, "hdl_clk_period_ns"):
+        await RisingEdge(clk)
+        hdl_period_ns = int(dut.hdl_clk_period_ns.value)
+        if hdl_period_ns != period_ns:
+            raise ValueError(
+                f"{clk_signal} is generated in HDL with a {hdl_period_ns}ns period, "
+                f"not {period_ns}ns (set the wrapper's CLK_PERIOD generic)"
+            )
+        dut._log.info(f"✓ Clock '{clk_signal}' generated in HDL ({period_ns}ns period = {1000/period_ns:.1f}MHz)")
+        return None
+
+    running = _clock_tasks.get(id(clk))
+    if running is not None and not running.done():
+        return running
+
     clock = cocotb.start_soon(Clock(clk, period_ns, units="ns").start())
+    _clock_tasks[id(clk)] = clock
     dut._log.info(f"✓ Clock started on '{clk_signal}' ({period_ns}ns period = {1000/period_ns:.1f}MHz)")
     return clock
 
@@ -209,8 +295,8 @@ async def reset_active_low(dut, cycles=2, rst_signal="rst_n"):
         await reset_active_low(dut, cycles=5)
         await reset_active_low(dut, rst_signal="nReset")
     """
-    rst = getattr(dut, rst_signal)
-    clk = dut.clk
+    rst = _signal(dut, rst_signal)
+    clk = _signal(dut, "clk")
 
     # Apply reset
     rst.value = 0
@@ -237,15 +323,8 @@ async def reset_active_high(dut, cycles=2, rst_signal="rst"):
         await reset_active_high(dut, rst_signal="Reset")  # MCC style
     """
     # Try specified signal name first, fall back to common alternatives
-    if hasattr(dut, rst_signal):
-        rst = getattr(dut, rst_signal)
-    elif hasattr(dut, "Reset"):
-        rst = dut.Reset
-        rst_signal = "Reset"
-    else:
-        rst = getattr(dut, rst_signal)  # Will raise AttributeError if not found
-
-    clk = dut.clk if hasattr(dut, "clk") else dut.Clk
+    rst = _signal(dut, rst_signal, "Reset")
+    clk = _signal(dut, "clk", "Clk")
 
     # Apply reset
     rst.value = 1
@@ -284,14 +363,24 @@ async def reset_dut(dut, active_low=True, cycles=2, rst_signal=None):
 # Signal Monitoring and Counting
 # =============================================================================
 
-async def count_pulses(signal, clk, num_cycles):
+async def count_pulses(signal, clk, num_cycles, counter=None):
     """
     Count how many times a signal goes high (pulses) over a number of clock cycles
 
+    The signal is sampled at each rising edge of `clk`, so a signal held high
+    for several cycles counts once per cycle (a divide-by-1 clk_en counts
+    `num_cycles`).
+
     Args:
         signal: Signal to monitor (e.g., dut.clk_en)
         clk: Clock signal to synchronize to (e.g., dut.clk)
         num_cycles: Number of clock cycles to observe
+        counter: Optional HDL pulse counter on `signal` (the `count` port of a
+            forge_cocotb_pulse_counter in the test wrapper). The count is
+            then two reads around one ClockCycles wait instead of
+            `num_cycles` Python wakeups. The window starts at the current
+            edge rather than the next one, which gives the same result for
+            periodic strobes observed over whole periods.
 
     Returns:
         int: Number of pulses detected
@@ -299,10 +388,18 @@ async def count_pulses(signal, clk, num_cycles):
     Example:
         pulses = await count_pulses(dut.clk_en, dut.clk, 100)
         assert pulses == 10, f"Expected 10 pulses, got {pulses}"
+
+        pulses = await count_pulses(dut.clk_en, dut.clk, 100, counter=dut.clk_en_count)
     """
+    if counter is not None:
+        start = int(counter.value)
+        await ClockCycles(clk, num_cycles)
+        return (int(counter.value) - start) % (1 << len(counter))
+
     count = 0
+    edge = RisingEdge(clk)
     for _ in range(num_cycles):
-        await RisingEdge(clk)
+        await edge
         if signal.value == 1:
             count += 1
     return count
@@ -312,6 +409,10 @@ async def wait_for_value(signal, expected_value, clk, timeout_cycles=1000):
     """
     Wait for a signal to reach an expected value (with timeout)
 
+    The signal is sampled at each rising edge of `clk`, so a value that is
+    already present still returns on the next edge, and glitches between
+    edges are not seen.
+
     Args:
         signal: Signal to monitor
         expected_value: Value to wait for
@@ -325,8 +426,9 @@ async def wait_for_value(signal, expected_value, clk, timeout_cycles=1000):
         success = await wait_for_value(dut.done, 1, dut.clk)
         assert success, "Module never signaled done"
     """
-    for cycle in range(timeout_cycles):
-        await RisingEdge(clk)
+    edge = RisingEdge(clk)
+    for _ in range(timeout_cycles):
+        await edge
         if signal.value == expected_value:
             return True
     return False
@@ -336,6 +438,9 @@ async def capture_signal_sequence(signal, clk, num_cycles):
     """
     Capture a sequence of signal values over multiple clock cycles
 
+    Each value is sampled at the rising edge of `clk`, i.e. the value the
+    signal held going into that edge (before the edge's updates settle).
+
     Args:
         signal: Signal to capture
         clk: Clock signal
@@ -348,10 +453,11 @@ async def capture_signal_sequence(signal, clk, num_cycles):
         sequence = await capture_signal_sequence(dut.state, dut.clk, 20)
         assert sequence == [0, 0, 1, 2, 3, 0, 0, ...]  # Verify state transitions
     """
-    values = []
-    for _ in range(num_cycles):
-        await RisingEdge(clk)
-        values.append(int(signal.value))
+    values = [0] * num_cycles
+    edge = RisingEdge(clk)
+    for i in range(num_cycles):
+        await edge
+        values[i] = int(signal.value)
     return values
 
 
@@ -446,7 +552,7 @@ def assert_signal_value(signal, expected, message=""):
         assert False, msg
 
 
-async def assert_pulse_count(signal, clk, cycles, expected, tolerance=0):
+async def assert_pulse_count(signal, clk, cycles, expected, tolerance=0, counter=None):
     """
     Assert that a signal pulses expected number of times (with optional tolerance)
 
@@ -456,11 +562,12 @@ async def assert_pulse_count(signal, clk, cycles, expected, tolerance=0):
         cycles: Number of cycles to observe
         expected: Expected pulse count
         tolerance: Allowed deviation (default: 0)
+        counter: Optional HDL pulse counter on `signal` (see count_pulses)
 
     Example:
         await assert_pulse_count(dut.clk_en, dut.clk, 100, 10, tolerance=1)
     """
-    actual = await count_pulses(signal, clk, cycles)
+    actual = await count_pulses(signal, clk, cycles, counter=counter)
 
     if tolerance > 0:
         passed = abs(actual - expected) <= tolerance
@@ -488,6 +595,9 @@ def log_signal_table(dut, signal_names, title="Signal Values"):
     Example:
         log_signal_table(dut, ["clk_en", "enable", "div_sel", "stat_reg"])
     """
+    if not dut._log.isEnabledFor(logging.INFO):
+        return  # Skip the signal reads as well as the formatting
+
     dut._log.info("=" * 60)
     dut._log.info(title)
     dut._log.info("-" * 60)
@@ -502,6 +612,10 @@ def log_signal_table(dut, signal_names, title="Signal Values"):
 # MCC (Moku CustomWrapper) Helpers
 # =============================================================================
 
+# Network-delay jitter for mcc_set_regs()/mcc_disable(). Seeded from cocotb's
+# RANDOM_SEED so runs stay reproducible, without sharing the global generator.
+_rng = random.Random(getattr(cocotb, "RANDOM_SEED", None))
+
 async def init_mcc_inputs(dut):
     """
     Initialize all MCC input channels to zero
@@ -570,36 +684,42 @@ async def mcc_set_regs(dut, control_regs,
         await mcc_set_regs(dut, {...},
                           simulate_network_delay=False)  # No delay, immediate update
     """
-    import random
-    from cocotb.triggers import Timer, ClockCycles
+    # Per-register log lines are formatted only when INFO is enabled
+    log_info = dut._log.isEnabledFor(logging.INFO)
 
     # Total delay before starting register writes
     if simulate_network_delay and total_delay_ms is None:
-        total_delay_ms = random.uniform(10, 200)  # 10-200ms realistic range
+        total_delay_ms = _rng.uniform(10, 200)  # 10-200ms realistic range
 
-    if simulate_network_delay and total_delay_ms > 0:
-        delay_ns = int(total_delay_ms * 1_000_000)
-        dut._log.info(f"⏱  Network latency: {total_delay_ms:.1f}ms")
+    # Skip the Timer (and its GPI callback) when the delay rounds to 0 ns
+    delay_ns = int(total_delay_ms * 1_000_000) if simulate_network_delay else 0
+    if delay_ns > 0:
+        if log_info:
+            dut._log.info("⏱  Network latency: %.1fms", total_delay_ms)
         await Timer(delay_ns, units="ns")
 
     # Write each register with optional per-register delay
-    for reg_num, value in sorted(control_regs.items()):
+    regs = sorted(control_regs.items())
+    handles = _control_handles(dut, tuple(reg_num for reg_num, _ in regs))
+    for (reg_num, value), handle in zip(regs, handles):
         # Mask out bit 31 from CR0 if set_mcc_ready=True (we'll set it last)
         if reg_num == 0 and set_mcc_ready:
             value = value & 0x7FFFFFFF  # Clear bit 31
 
-        getattr(dut, f"Control{reg_num}").value = value
-        dut._log.info(f"  Control{reg_num} ← 0x{value:08X}")
+        handle.value = value
+        if log_info:
+            dut._log.info("  Control%d ← 0x%08X", reg_num, value)
 
         # Per-register delay (simulate sequential network writes)
         if simulate_network_delay:
             if per_reg_delay_ms is None:
-                delay = random.uniform(1, 10)  # 1-10ms per register
+                delay = _rng.uniform(1, 10)  # 1-10ms per register
             else:
                 delay = per_reg_delay_ms
 
-            if delay > 0:
-                await Timer(int(delay * 1_000_000), units="ns")
+            delay_ns = int(delay * 1_000_000)
+            if delay_ns > 0:
+                await Timer(delay_ns, units="ns")
 
     await ClockCycles(dut.Clk, 2)
 
@@ -612,7 +732,8 @@ async def mcc_set_regs(dut, control_regs,
         validate_control0(cr0_ready, context="mcc_set_regs()")
 
         dut.Control0.value = cr0_ready
-        dut._log.info(f"✓ MCC_READY asserted (CR0 = 0x{cr0_ready:08X})")
+        if log_info:
+            dut._log.info("✓ MCC_READY asserted (CR0 = 0x%08X)", cr0_ready)
         await ClockCycles(dut.Clk, 2)
 
 
@@ -642,7 +763,7 @@ async def wait_for_mcc_ready(dut, settle_cycles=10):
     Example - Longer settle time:
         await wait_for_mcc_ready(dut, settle_cycles=50)
     """
-    clk = dut.Clk if hasattr(dut, "Clk") else dut.clk
+    clk = _signal(dut, "Clk", "clk")
     await ClockCycles(clk, settle_cycles)
     dut._log.info(f"✓ Module settled ({settle_cycles} cycles after MCC_READY)")
 
@@ -674,11 +795,12 @@ async def wait_for_first_clk_en(dut, clk_en_signal="clk_en", timeout_cycles=1000
     Example - Custom signal name:
         success = await wait_for_first_clk_en(dut, clk_en_signal="ClkEn")
     """
-    clk = dut.Clk if hasattr(dut, "Clk") else dut.clk
-    clk_en = getattr(dut, clk_en_signal)
+    clk = _signal(dut, "Clk", "clk")
+    clk_en = _signal(dut, clk_en_signal)
 
+    edge = RisingEdge(clk)
     for cycle in range(timeout_cycles):
-        await RisingEdge(clk)
+        await edge
         if int(clk_en.value) == 1:
             dut._log.info(f"✓ First clk_en pulse detected (after {cycle} cycles)")
             return True
@@ -712,19 +834,18 @@ async def mcc_disable(dut, simulate_network_delay=True, delay_ms=None):
     Example - Immediate disable (no network delay):
         await mcc_disable(dut, simulate_network_delay=False)
     """
-    import random
-    from cocotb.triggers import Timer, ClockCycles
-
     if simulate_network_delay:
         if delay_ms is None:
-            delay_ms = random.uniform(1, 10)
-        await Timer(int(delay_ms * 1_000_000), units="ns")
+            delay_ms = _rng.uniform(1, 10)
+        delay_ns = int(delay_ms * 1_000_000)
+        if delay_ns > 0:
+            await Timer(delay_ns, units="ns")
 
     cr0_current = int(dut.Control0.value)
     cr0_disabled = cr0_current & 0x7FFFFFFF  # Clear bit 31
     dut.Control0.value = cr0_disabled
 
-    clk = dut.Clk if hasattr(dut, "Clk") else dut.clk
+    clk = _signal(dut, "Clk", "clk")
     await ClockCycles(clk, 2)
 
     dut._log.info(f"✓ MCC_READY cleared (CR0 = 0x{cr0_disabled:08X}) - module disabled")
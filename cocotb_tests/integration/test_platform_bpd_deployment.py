@@ -14,10 +14,17 @@ NO VHDL DUT REQUIRED - These are platform infrastructure tests.
 
 import cocotb
 from cocotb.triggers import Timer
+import functools
 from pathlib import Path
 import yaml
 from typing import Any, Dict
 
+# libyaml-backed loader when PyYAML was built with it (much faster parsing)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Platform testing infrastructure
 from cocotb_test.platform.simulation_backend import SimulationBackend
 from cocotb_test.platform.network_cr import NetworkCRInterface
@@ -30,18 +37,27 @@ from moku_models import MokuConfig, SlotConfig, MokuConnection
 from moku_models.platforms.moku_go import MOKU_GO_PLATFORM
 
 
+@functools.lru_cache(maxsize=None)
+def _load_yaml(yaml_path: Path, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML file; mtime_ns is part of the cache key only"""
+    with open(yaml_path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def load_deployment_yaml(yaml_path: Path) -> Dict[str, Any]:
     """
     Load BPD deployment YAML file.
 
+    Parsed once per file version: repeat loads of an unchanged file return
+    the same (shared, do not mutate) dict.
+
     Args:
         yaml_path: Path to deployment YAML
 
     Returns:
         Parsed YAML data
     """
-    with open(yaml_path, 'r') as f:
-        return yaml.safe_load(f)
+    return _load_yaml(yaml_path, yaml_path.stat().st_mtime_ns)
 
 
 def parse_deployment_to_moku_config(deployment: Dict[str, Any]) -> MokuConfig:
@@ -87,6 +103,13 @@ def parse_deployment_to_moku_config(deployment: Dict[str, Any]) -> MokuConfig:
     )
 
 
+# Deployment YAMLs under test, by short name
+DEPLOYMENT_FILES = {
+    "setup1": "bpd-deployment-setup1-dummy-dut.yaml",
+    "setup2": "bpd-deployment-setup2-real-dut.yaml",
+}
+
+
 class PlatformDeploymentTests:
     """
     Test suite for BPD deployment YAML integration.
@@ -101,6 +124,35 @@ class PlatformDeploymentTests:
         self.passed = 0
         self.failed = 0
 
+        # Parsed deployments and MokuConfigs, shared by every test
+        self._yaml_cache: Dict[str, Dict[str, Any]] = {}
+        self._cfg_cache: Dict[str, MokuConfig] = {}
+        self._routing_cache: Dict[str, frozenset] = {}
+
+    def _deployment(self, name: str) -> Dict[str, Any]:
+        """Parsed deployment YAML for a DEPLOYMENT_FILES name (loaded once)."""
+        deployment = self._yaml_cache.get(name)
+        if deployment is None:
+            deployment = load_deployment_yaml(self.deployment_root / DEPLOYMENT_FILES[name])
+            self._yaml_cache[name] = deployment
+        return deployment
+
+    def _cfg(self, name: str) -> MokuConfig:
+        """MokuConfig for a DEPLOYMENT_FILES name (parsed once)."""
+        config = self._cfg_cache.get(name)
+        if config is None:
+            config = parse_deployment_to_moku_config(self._deployment(name))
+            self._cfg_cache[name] = config
+        return config
+
+    def _routes(self, name: str) -> frozenset:
+        """(source, destination) pairs of a deployment's routing, for O(1) lookups."""
+        routes = self._routing_cache.get(name)
+        if routes is None:
+            routes = frozenset((c.source, c.destination) for c in self._cfg(name).routing)
+            self._routing_cache[name] = routes
+        return routes
+
     def log(self, message: str) -> None:
         """Log message to CocoTB."""
         cocotb.log.info(f"[BPD-DEPLOYMENT] {message}")
@@ -119,10 +171,8 @@ class PlatformDeploymentTests:
 
     async def test_load_setup1_yaml(self) -> None:
         """Test: Load bpd-deployment-setup1-dummy-dut.yaml"""
-        yaml_path = self.deployment_root / "bpd-deployment-setup1-dummy-dut.yaml"
-
         # Load YAML
-        deployment = load_deployment_yaml(yaml_path)
+        deployment = self._deployment("setup1")
 
         # Basic structure validation
         assert 'platform' in deployment, "Missing 'platform' field"
@@ -136,10 +186,8 @@ class PlatformDeploymentTests:
 
     async def test_load_setup2_yaml(self) -> None:
         """Test: Load bpd-deployment-setup2-real-dut.yaml"""
-        yaml_path = self.deployment_root / "bpd-deployment-setup2-real-dut.yaml"
-
         # Load YAML
-        deployment = load_deployment_yaml(yaml_path)
+        deployment = self._deployment("setup2")
 
         # Basic structure validation
         assert 'platform' in deployment
@@ -153,11 +201,8 @@ class PlatformDeploymentTests:
 
     async def test_parse_setup1_to_moku_config(self) -> None:
         """Test: Parse setup1 YAML to MokuConfig"""
-        yaml_path = self.deployment_root / "bpd-deployment-setup1-dummy-dut.yaml"
-        deployment = load_deployment_yaml(yaml_path)
-
         # Parse to MokuConfig
-        config = parse_deployment_to_moku_config(deployment)
+        config = self._cfg("setup1")
 
         # Validate MokuConfig
         assert config.platform.name == "Moku:Go"
@@ -186,9 +231,7 @@ class PlatformDeploymentTests:
 
     async def test_validate_setup1_routing(self) -> None:
         """Test: Validate setup1 routing matrix"""
-        yaml_path = self.deployment_root / "bpd-deployment-setup1-dummy-dut.yaml"
-        deployment = load_deployment_yaml(yaml_path)
-        config = parse_deployment_to_moku_config(deployment)
+        config = self._cfg("setup1")
 
         # Validate routing
         errors = config.validate_routing()
@@ -199,41 +242,25 @@ class PlatformDeploymentTests:
             assert False, f"Routing validation failed: {errors}"
 
         # Check for BPD-Debug-Bus routing (Slot2OutD → Slot1InA)
-        debug_bus_found = False
-        for conn in config.routing:
-            if conn.source == "Slot2OutD" and conn.destination == "Slot1InA":
-                debug_bus_found = True
-                self.log(f"Found BPD-Debug-Bus: {conn.source} → {conn.destination}")
-                break
-
-        assert debug_bus_found, "BPD-Debug-Bus routing (Slot2OutD → Slot1InA) not found"
+        assert ("Slot2OutD", "Slot1InA") in self._routes("setup1"), \
+            "BPD-Debug-Bus routing (Slot2OutD → Slot1InA) not found"
+        self.log("Found BPD-Debug-Bus: Slot2OutD → Slot1InA")
 
     async def test_compare_setup1_vs_setup2_routing(self) -> None:
         """Test: Compare routing differences between setup1 (dummy-DUT) and setup2 (real-DUT)"""
-        # Load both configs
-        setup1_path = self.deployment_root / "bpd-deployment-setup1-dummy-dut.yaml"
-        setup2_path = self.deployment_root / "bpd-deployment-setup2-real-dut.yaml"
-
-        setup1 = load_deployment_yaml(setup1_path)
-        setup2 = load_deployment_yaml(setup2_path)
-
-        config1 = parse_deployment_to_moku_config(setup1)
-        config2 = parse_deployment_to_moku_config(setup2)
+        # Routing of both configs (setup1 already parsed by the earlier tests)
+        routes1 = self._routes("setup1")
+        routes2 = self._routes("setup2")
 
         # Both should have BPD-Debug-Bus (Slot2OutD → Slot1InA)
-        debug_bus_1 = any(c.source == "Slot2OutD" and c.destination == "Slot1InA" for c in config1.routing)
-        debug_bus_2 = any(c.source == "Slot2OutD" and c.destination == "Slot1InA" for c in config2.routing)
-
-        assert debug_bus_1, "Setup1 missing BPD-Debug-Bus"
-        assert debug_bus_2, "Setup2 missing BPD-Debug-Bus"
+        assert ("Slot2OutD", "Slot1InA") in routes1, "Setup1 missing BPD-Debug-Bus"
+        assert ("Slot2OutD", "Slot1InA") in routes2, "Setup2 missing BPD-Debug-Bus"
 
         # Setup1 should have synthetic trigger (Slot1OutA → Slot2InA)
-        synthetic_trigger = any(c.source == "Slot1OutA" and c.destination == "Slot2InA" for c in config1.routing)
-        assert synthetic_trigger, "Setup1 missing synthetic trigger routing"
+        assert ("Slot1OutA", "Slot2InA") in routes1, "Setup1 missing synthetic trigger routing"
 
         # Setup2 should have real DUT trigger (IN1 → Slot2InA)
-        real_trigger = any(c.source == "IN1" and c.destination == "Slot2InA" for c in config2.routing)
-        assert real_trigger, "Setup2 missing real DUT trigger routing"
+        assert ("IN1", "Slot2InA") in routes2, "Setup2 missing real DUT trigger routing"
 
         self.log(f"✓ Setup1 (dummy-DUT): synthetic trigger from Slot1OutA")
         self.log(f"✓ Setup2 (real-DUT): external trigger from IN1")
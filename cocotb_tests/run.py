@@ -27,6 +27,11 @@ from forge_cocotb.runner import main as runner_main
 sys.path.insert(0, str(Path(__file__).parent))
 from test_configs import TESTS_CONFIG
 
+# Component test packages (forge_*_tests) import as top-level packages.
+# Adding their directory once here - the runner hands sys.path to the
+# simulator's Python - keeps individual test modules free of sys.path edits.
+sys.path.insert(0, str(Path(__file__).parent / "components"))
+
 
 if __name__ == "__main__":
     # No post-test hook needed for forge-vhdl (library, not deployed to MCC)
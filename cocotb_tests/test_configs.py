@@ -14,10 +14,11 @@ Date: 2025-11-04
 
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, List
+
+from forge_cocotb._paths import PROJECT_ROOT
 
 # Project paths
-PROJECT_ROOT = Path(__file__).parent.parent
 VHDL = PROJECT_ROOT / "vhdl"
 VHDL_PKG = VHDL / "packages"
 VHDL_UTIL = VHDL / "components" / "utilities"
@@ -25,6 +26,10 @@ VHDL_DEBUG = VHDL / "components" / "debugging"
 VHDL_LOADER = VHDL / "components" / "loader"
 TESTS = PROJECT_ROOT / "cocotb_tests"  # Test directory (contains cocotb_test_wrappers/ and platform test files)
 
+# Power-on reset length (clock edges) of the voltage package wrappers. Passed
+# to them as the POR_CYCLES generic; their tests wait this long before checking.
+POR_CYCLES = 3
+
 
 @dataclass
 class TestConfig:
@@ -35,6 +40,7 @@ class TestConfig:
     test_module: str
     category: str = "misc"
     ghdl_args: List[str] = field(default_factory=lambda: ["--std=08"])
+    parameters: Dict[str, object] = field(default_factory=dict)  # Toplevel generics
 
 
 # ==================================================================================
@@ -48,8 +54,10 @@ TESTS_CONFIG = {
         name="forge_util_clk_divider",
         sources=[
             VHDL_UTIL / "forge_util_clk_divider.vhd",
+            TESTS / "cocotb_test_wrappers" / "forge_cocotb_pulse_counter.vhd",         # clk_en_count
+            TESTS / "cocotb_test_wrappers" / "forge_util_clk_divider_tb_wrapper.vhd",  # HDL clock
         ],
-        toplevel="forge_util_clk_divider",
+        toplevel="forge_util_clk_divider_tb_wrapper",
         test_module="components.test_forge_util_clk_divider_progressive",
         category="utilities",
     ),
@@ -58,8 +66,9 @@ TESTS_CONFIG = {
         name="forge_util_majority_voter",
         sources=[
             VHDL_UTIL / "forge_util_majority_voter.vhd",
+            TESTS / "cocotb_test_wrappers" / "forge_util_majority_voter_tb_wrapper.vhd",  # HDL clock
         ],
-        toplevel="forge_util_majority_voter",
+        toplevel="forge_util_majority_voter_tb_wrapper",
         test_module="components.test_forge_util_majority_voter_progressive",
         category="utilities",
     ),
@@ -68,8 +77,9 @@ TESTS_CONFIG = {
         name="forge_util_edge_detector_pw",
         sources=[
             PROJECT_ROOT / "workflow" / "artifacts" / "vhdl" / "forge_util_edge_detector_pw.vhd",
+            TESTS / "cocotb_test_wrappers" / "forge_util_edge_detector_pw_tb_wrapper.vhd",  # HDL clock
         ],
-        toplevel="forge_util_edge_detector_pw",
+        toplevel="forge_util_edge_detector_pw_tb_wrapper",
         test_module="components.test_forge_util_edge_detector_pw_progressive",
         category="utilities",
     ),
@@ -80,7 +90,7 @@ TESTS_CONFIG = {
         name="forge_lut_pkg",
         sources=[
             VHDL_PKG / "forge_lut_pkg.vhd",              # LUT package
-            TESTS / "cocotb_test_wrappers" / "forge_lut_pkg_tb_wrapper.vhd",      # Testbench wrapper
+            TESTS / "cocotb_test_wrappers" / "forge_lut_pkg_tb_wrapper.vhd",      # Testbench wrapper (HDL clock)
         ],
         toplevel="forge_lut_pkg_tb_wrapper",
         test_module="components.test_forge_lut_pkg_progressive",
@@ -91,7 +101,7 @@ TESTS_CONFIG = {
         name="forge_voltage_3v3_pkg",
         sources=[
             VHDL_PKG / "forge_voltage_3v3_pkg.vhd",
-            TESTS / "cocotb_test_wrappers" / "forge_voltage_3v3_pkg_tb_wrapper.vhd",
+            TESTS / "cocotb_test_wrappers" / "forge_voltage_3v3_pkg_tb_wrapper.vhd",  # HDL clock
         ],
         toplevel="forge_voltage_3v3_pkg_tb_wrapper",
         test_module="components.test_forge_voltage_3v3_pkg_progressive",
@@ -102,22 +112,24 @@ TESTS_CONFIG = {
         name="forge_voltage_5v0_pkg",
         sources=[
             VHDL_PKG / "forge_voltage_5v0_pkg.vhd",
-            TESTS / "cocotb_test_wrappers" / "forge_voltage_5v0_pkg_tb_wrapper.vhd",
+            TESTS / "cocotb_test_wrappers" / "forge_voltage_5v0_pkg_tb_wrapper.vhd",  # HDL clock
         ],
         toplevel="forge_voltage_5v0_pkg_tb_wrapper",
         test_module="components.test_forge_voltage_5v0_pkg_progressive",
         category="packages",
+        parameters={"POR_CYCLES": POR_CYCLES},
     ),
 
     "forge_voltage_5v_bipolar_pkg": TestConfig(
         name="forge_voltage_5v_bipolar_pkg",
         sources=[
             VHDL_PKG / "forge_voltage_5v_bipolar_pkg.vhd",
-            TESTS / "cocotb_test_wrappers" / "forge_voltage_5v_bipolar_pkg_tb_wrapper.vhd",
+            TESTS / "cocotb_test_wrappers" / "forge_voltage_5v_bipolar_pkg_tb_wrapper.vhd",  # HDL clock
         ],
         toplevel="forge_voltage_5v_bipolar_pkg_tb_wrapper",
         test_module="components.test_forge_voltage_5v_bipolar_pkg_progressive",
         category="packages",
+        parameters={"POR_CYCLES": POR_CYCLES},
     ),
 
     # === Debugging (forge_debug_*) ===
@@ -0,0 +1,79 @@
+"""
+Cached cocotb configuration lookups for the test runner.
+
+The Makefile flow runs `cocotb-config --libpython` for every simulator
+launch; cocotb_tools.runner does the same search through find_libpython on
+every runner.test() unless LIBPYTHON_LOC is already set. Resolve it once,
+remember it on disk keyed by interpreter and cocotb version, and export it
+so each test launch skips the search.
+
+Usage:
+    from forge_cocotb._config_cache import export_cocotb_config
+    export_cocotb_config()  # before the first runner.test()
+
+Author: Moku Instrument Forge Team
+Date: 2025-11-10
+"""
+
+import functools
+import json
+import os
+import sys
+from typing import Optional
+
+
+CONFIG_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "forge_cocotb", "config.json")
+
+
+def _cache_key() -> str:
+    """Interpreter + cocotb version: either changing invalidates the entry"""
+    import cocotb
+    return f"{sys.executable}:{cocotb.__version__}"
+
+
+@functools.lru_cache(maxsize=1)
+def libpython_path() -> Optional[str]:
+    """
+    Locate libpython for the GPI, memoized in-process and on disk
+
+    Returns:
+        Path to the shared libpython, or None if it cannot be found
+    """
+    key = _cache_key()
+
+    try:
+        with open(CONFIG_CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    if isinstance(cache, dict):
+        path = cache.get(key)
+        if path and os.path.exists(path):
+            return path
+
+    from find_libpython import find_libpython
+
+    path = find_libpython()
+    if not path:
+        return None
+
+    # Write atomically so parallel runners never read a partial file
+    try:
+        os.makedirs(os.path.dirname(CONFIG_CACHE_FILE), exist_ok=True)
+        tmp = f"{CONFIG_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({key: path}, f)
+        os.replace(tmp, CONFIG_CACHE_FILE)
+    except OSError:
+        pass  # Cache is best-effort; the resolved path is still valid
+
+    return path
+
+
+def export_cocotb_config() -> None:
+    """Export LIBPYTHON_LOC for cocotb_tools.runner (explicit user value wins)"""
+    if "LIBPYTHON_LOC" in os.environ:
+        return
+    path = libpython_path()
+    if path:
+        os.environ["LIBPYTHON_LOC"] = path
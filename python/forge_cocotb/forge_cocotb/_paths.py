@@ -0,0 +1,20 @@
+"""
+Repository paths shared by test configs and per-module constants.
+
+Resolved once at first import so every *_constants.py module reuses the
+same Path instead of climbing Path(__file__).parent chains on its own.
+
+Usage:
+    from forge_cocotb._paths import PROJECT_ROOT
+    VHDL_DIR = PROJECT_ROOT / "vhdl"
+
+Author: Moku Instrument Forge Team
+Date: 2025-11-10
+"""
+
+from pathlib import Path
+from typing import Final
+
+
+# python/forge_cocotb/forge_cocotb/_paths.py -> repository root
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[3]
@@ -20,6 +20,8 @@ Version: 1.0.0
 
 import sys
 import argparse
+import hashlib
+import shutil
 from pathlib import Path
 from typing import Optional, Callable, Dict
 import os
@@ -27,6 +29,7 @@ import threading
 
 # Import from forge_cocotb package
 from .ghdl_filter import GHDLOutputFilter, FilterLevel
+from ._config_cache import export_cocotb_config
 
 # CocoTB imports
 try:
@@ -139,7 +142,8 @@ class TestRunner:
         verbose: bool = False,
         filter_output: bool = True,
         post_test_hook: Optional[Callable] = None,
-        tests_dir: Optional[Path] = None
+        tests_dir: Optional[Path] = None,
+        jobs: int = 1
     ):
         """
         Initialize test runner.
@@ -149,11 +153,48 @@ class TestRunner:
             filter_output: Enable GHDL output filtering
             post_test_hook: Optional callback(config, test_name) called after test passes
             tests_dir: Test directory (defaults to current directory)
+            jobs: Tests to run at once for --all/--category (1 = sequential)
         """
         self.verbose = verbose
         self.filter_output = filter_output
         self.post_test_hook = post_test_hook
         self.tests_dir = tests_dir or Path.cwd()
+        self.jobs = max(1, jobs)
+
+    @staticmethod
+    def _build_dir(test_name: str, sources, build_args) -> Path:
+        """
+        Build directory for a test: sim_build/<test_name>/<source key>.
+
+        The key hashes the HDL sources and build args, so re-running an
+        unchanged test (e.g. P1 then P2) reuses a work library that is already
+        up to date and nothing is recompiled; any edit gets a fresh directory.
+        Parallel workers never share one, and pytest-xdist workers driving
+        TestRunner get the worker id appended.
+
+        Directories left behind by earlier keys of the same test (and the same
+        xdist worker) are removed, so sim_build holds one build per test.
+        """
+        digest = hashlib.sha1()
+        for arg in build_args:
+            digest.update(arg.encode() + b"\0")
+        for src in sources:
+            digest.update(str(src).encode() + b"\0")
+            digest.update(Path(src).read_bytes())
+        key = digest.hexdigest()[:12]
+
+        worker = os.environ.get("PYTEST_XDIST_WORKER")
+        suffix = f"_{worker}" if worker else ""
+        key += suffix
+
+        test_dir = Path("sim_build") / test_name
+        if test_dir.is_dir():
+            for old in test_dir.iterdir():
+                # Other workers' directories may be in use - leave them alone
+                own = old.name.endswith(suffix) if worker else "_" not in old.name
+                if own and old.name != key and old.is_dir():
+                    shutil.rmtree(old, ignore_errors=True)
+        return test_dir / key
 
     def run_test(self, test_name: str, tests_config: Dict) -> bool:
         """
@@ -196,6 +237,7 @@ class TestRunner:
 
         # Build configuration
         build_args = config.ghdl_args.copy()
+        parameters = dict(getattr(config, "parameters", {}))  # Toplevel generics
 
         # Add simulation arguments (empty for now - keeping it simple!)
         # TODO: Add back GHDL optimization flags once basic testing works:
@@ -207,6 +249,7 @@ class TestRunner:
         # Set CocotB environment variables
         os.environ["COCOTB_REDUCED_LOG_FMT"] = "1"
         os.environ["COCOTB_LOG_LEVEL"] = "DEBUG" if self.verbose else "INFO"
+        export_cocotb_config()  # libpython lookup: once per machine, not per test
 
         # Determine filter level
         filter_level_str = os.environ.get("GHDL_FILTER_LEVEL", "normal").lower()
@@ -227,8 +270,10 @@ class TestRunner:
             runner.build(
                 sources=[str(src) for src in config.sources],
                 hdl_toplevel=config.toplevel,
-                always=True,
+                always=False,  # Keyed build_dir: an existing one is current
                 build_args=build_args,
+                parameters=parameters,
+                build_dir=self._build_dir(test_name, config.sources, build_args),
             )
 
             # Run tests with BULLETPROOF output filtering
@@ -241,6 +286,7 @@ class TestRunner:
                         hdl_toplevel=config.toplevel,
                         test_module=config.test_module,
                         test_args=sim_args,
+                        parameters=parameters,
                     )
                 # Print filter summary
                 if filtered.filter.stats.filtered_lines > 0:
@@ -253,6 +299,7 @@ class TestRunner:
                     hdl_toplevel=config.toplevel,
                     test_module=config.test_module,
                     test_args=sim_args,
+                    parameters=parameters,
                 )
 
             # Call post-test hook if provided
@@ -281,14 +328,11 @@ class TestRunner:
         Returns:
             Dict of {test_name: passed}
         """
-        results = {}
         test_names = list(tests_config.keys())
 
         print(f"\n🚀 Running {len(test_names)} tests...\n")
 
-        for i, test_name in enumerate(test_names, 1):
-            print(f"\n[{i}/{len(test_names)}] {test_name}")
-            results[test_name] = self.run_test(test_name, tests_config)
+        results = self._run_tests(test_names, tests_config)
 
         # Summary
         print("\n" + "=" * 70)
@@ -308,6 +352,55 @@ class TestRunner:
 
         return results
 
+    def _run_tests(self, test_names, tests_config: Dict) -> Dict[str, bool]:
+        """
+        Run the named tests, in order or across self.jobs worker processes.
+
+        run_test() changes the working directory, os.environ and fds 1/2, so
+        parallel tests each get their own process and their own build
+        directory (a shared GHDL work library would race).
+
+        Returns:
+            Dict of {test_name: passed}, in test_names order
+        """
+        results = {}
+        total = len(test_names)
+
+        if self.jobs == 1 or total <= 1:
+            for i, test_name in enumerate(test_names, 1):
+                print(f"\n[{i}/{total}] {test_name}")
+                results[test_name] = self.run_test(test_name, tests_config)
+            return results
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Hooks run here in the parent: they need not be picklable
+        worker = TestRunner(
+            verbose=self.verbose,
+            filter_output=self.filter_output,
+            tests_dir=self.tests_dir,
+        )
+
+        workers = min(self.jobs, total)
+        print(f"⚡ {workers} parallel workers\n")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                name: pool.submit(worker.run_test, name, tests_config)
+                for name in test_names
+            }
+            for i, test_name in enumerate(test_names, 1):
+                try:
+                    passed = futures[test_name].result()
+                except Exception as e:
+                    print(f"❌ Test '{test_name}' worker crashed: {e}")
+                    passed = False
+                if passed and self.post_test_hook:
+                    self.post_test_hook(tests_config[test_name], test_name)
+                results[test_name] = passed
+                print(f"[{i}/{total}] {test_name}: {'✅ PASS' if passed else '❌ FAIL'}")
+
+        return results
+
     def run_category(self, category: str, tests_config: Dict) -> Dict[str, bool]:
         """
         Run all tests in a category.
@@ -330,10 +423,7 @@ class TestRunner:
 
         print(f"\n🚀 Running {len(tests)} tests in category '{category}'...\n")
 
-        results = {}
-        for i, test_name in enumerate(sorted(tests.keys()), 1):
-            print(f"\n[{i}/{len(tests)}] {test_name}")
-            results[test_name] = self.run_test(test_name, tests_config)
+        results = self._run_tests(sorted(tests.keys()), tests_config)
 
         # Summary
         passed = sum(1 for v in results.values() if v)
@@ -392,6 +482,7 @@ def main(
 Examples:
   python run.py <test_name>                 # Run single test
   python run.py --all                       # Run all tests
+  python run.py --all -j 0                  # Run all tests, one per CPU
   python run.py --category=<category>       # Run category
   python run.py --list                      # List tests
   python run.py <test_name> --verbose       # Verbose output
@@ -418,6 +509,13 @@ Examples:
         action="store_true",
         help="List all available tests",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Parallel tests for --all/--category (0 = one per CPU, default: 1)",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -457,7 +555,8 @@ Examples:
         verbose=args.verbose,
         filter_output=not args.no_filter,
         post_test_hook=post_test_hook,
-        tests_dir=tests_dir
+        tests_dir=tests_dir,
+        jobs=args.jobs or os.cpu_count() or 1,
     )
 
     # Handle commands
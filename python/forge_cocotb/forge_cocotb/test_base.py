@@ -11,6 +11,8 @@ Date: 2025-01-26
 """
 
 import cocotb
+from cocotb.triggers import ClockCycles
+import logging
 import os
 from enum import IntEnum
 from typing import Optional
@@ -69,6 +71,10 @@ class TestBase:
                 pass
     """
 
+    # Extra cycles GHDL needs before registered outputs read back correctly;
+    # modules with a longer quirk override this. Other simulators skip it.
+    GHDL_SETTLE_CYCLES = 1
+
     def __init__(self, dut, module_name: str):
         """
         Initialize test base.
@@ -100,6 +106,19 @@ class TestBase:
         self.failed_count = 0
         self.current_phase = None
 
+        # VERBOSE/DEBUG detail lines are batched into one record per test;
+        # if COCOTB_LOG_LEVEL hides INFO they are dropped without buffering
+        self._buffered = []
+        self._info_enabled = dut._log.isEnabledFor(logging.INFO)
+
+        sim_name = (cocotb.SIM_NAME or "").lower()
+        self._settle_cycles = self.GHDL_SETTLE_CYCLES if sim_name.startswith("ghdl") else 0
+
+    async def settle(self):
+        """Wait out the simulator-specific settle cycles (no-op off GHDL)"""
+        if self._settle_cycles:
+            await ClockCycles(self.dut.clk, self._settle_cycles)
+
     def log(self, message: str, level: VerbosityLevel = VerbosityLevel.NORMAL):
         """
         Conditional logging based on verbosity level.
@@ -108,9 +127,20 @@ class TestBase:
             message: Message to log
             level: Required verbosity level for this message
         """
-        if self.verbosity >= level:
+        if self.verbosity < level or not self._info_enabled:
+            return
+        if level >= VerbosityLevel.VERBOSE:
+            self._buffered.append(message)
+        else:
+            self.flush_log()  # Keep ordering with earlier detail lines
             self.dut._log.info(message)
 
+    def flush_log(self):
+        """Emit buffered VERBOSE/DEBUG messages as a single log record"""
+        if self._buffered:
+            self.dut._log.info("\n".join(self._buffered))
+            self._buffered.clear()
+
     def log_separator(self, level: VerbosityLevel = VerbosityLevel.NORMAL):
         """Log a separator line"""
         self.log("=" * 60, level)
@@ -200,8 +230,10 @@ class TestBase:
 
         try:
             await test_func()
+            self.flush_log()
             self.log_test_pass(test_name)
         except Exception as e:
+            self.flush_log()
             self.log_test_fail(test_name, str(e))
             raise  # Re-raise to fail the test
 
@@ -240,6 +272,7 @@ class TestBase:
             await self.run_p4_exhaustive()
 
         # Print summary
+        self.flush_log()
         self.log_summary()
 
         # Fail if any tests failed